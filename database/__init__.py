@@ -1 +1,3 @@
-from .connection import db
\ No newline at end of file
+from .connection import db
+from .backends import Error, MySQLBackend, SQLiteBackend
+from .instrumentation import configure_logging
\ No newline at end of file
@@ -0,0 +1,137 @@
+import os
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+import mysql.connector
+
+# Every driver error the Database layer handles, whichever backend is active.
+Error = (mysql.connector.Error, sqlite3.Error)
+
+class MySQLBackend:
+    name = 'mysql'
+    # Row-level locking lets a second connection write while another transaction is open.
+    isolated_writes = True
+
+    def __init__(self, host='localhost', user='root', password='', database='lms_db'):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+
+    def connect(self):
+        # Autocommit, so a connection that only served reads does not keep an old InnoDB
+        # snapshot open while it sits in the pool; transactions are opened with begin().
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            autocommit=True
+        )
+
+    def begin(self, connection):
+        connection.start_transaction()
+
+    def translate(self, query):
+        return query
+
+    def cursor(self, connection, buffered=False):
+        return connection.cursor(buffered=buffered)
+
+    def ping(self, connection):
+        connection.ping(reconnect=True, attempts=2, delay=0)
+
+    def discard_unread(self, connection):
+        if connection.unread_result:
+            connection.consume_results()
+
+    def explain(self, connection, query, params):
+        cursor = connection.cursor(buffered=True)
+        try:
+            cursor.execute("EXPLAIN " + query, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+class SQLiteBackend:
+    """
+    Embedded backend for tests and single-node deployments. A new database file is created
+    from lms_db.sqlite.sql, and the MySQL dialect used in models/ is rewritten on the fly.
+    ':memory:' gives a private in-process database shared by every connection of this backend.
+    """
+    name = 'sqlite'
+    # SQLite has one writer per database, so a second connection would wait on the first.
+    isolated_writes = False
+    SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lms_db.sqlite.sql')
+    _memory_ids = 0
+
+    def __init__(self, path='lms_db.sqlite3', busy_timeout=30):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._uri = path == ':memory:'
+        if self._uri:
+            SQLiteBackend._memory_ids += 1
+            self.path = f"file:lms_memory_{os.getpid()}_{SQLiteBackend._memory_ids}?mode=memory&cache=shared"
+        self._schema_lock = threading.Lock()
+        self._keepalive = None
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout, uri=self._uri, check_same_thread=False)
+        connection.execute("PRAGMA foreign_keys = ON")
+        if not self._uri:
+            connection.execute("PRAGMA journal_mode = WAL")
+        state = {'last_insert_id': 0}
+
+        def last_insert_id(*value):
+            # MySQL's LAST_INSERT_ID(expr) stores expr for the session; LAST_INSERT_ID() reads it back.
+            if value:
+                state['last_insert_id'] = value[0]
+                return value[0]
+            return state['last_insert_id']
+
+        connection.create_function("LAST_INSERT_ID", -1, last_insert_id)
+        with self._schema_lock:
+            if self._uri and self._keepalive is None:
+                # A shared in-memory database lives only while a connection to it is open.
+                self._keepalive = sqlite3.connect(self.path, uri=True, check_same_thread=False)
+            if not connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'admins'").fetchone():
+                with open(self.SCHEMA, encoding='utf-8') as f:
+                    connection.executescript(f.read())
+        return connection
+
+    def begin(self, connection):
+        # The sqlite3 module opens a transaction before the first write on its own.
+        pass
+
+    def translate(self, query):
+        return translate_mysql(query)
+
+    def cursor(self, connection, buffered=False):
+        return connection.cursor()
+
+    def ping(self, connection):
+        connection.execute("SELECT 1")
+
+    def discard_unread(self, connection):
+        pass
+
+    def explain(self, connection, query, params):
+        rows = connection.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+        return [{'id': row[0], 'parent': row[1], 'detail': row[3]} for row in rows]
+
+_UPSERT = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I)
+
+@lru_cache(maxsize=1024)
+def translate_mysql(query):
+    """Rewrite the MySQL constructs used in models/ into SQLite syntax"""
+    parts = _UPSERT.split(query, maxsplit=1)
+    if len(parts) == 2:
+        head, assignments = parts
+        assignments = re.sub(r"\bVALUES\s*\(\s*`?(\w+)`?\s*\)", r"excluded.\1", assignments, flags=re.I)
+        if re.search(r"\bSELECT\b", head, re.I) and not re.search(r"\bWHERE\b", head, re.I):
+            head += " WHERE true"  # lets the parser tell INSERT ... SELECT apart from ON CONFLICT
+        query = f"{head} ON CONFLICT DO UPDATE SET {assignments}"
+    query = re.sub(r"\bIF\s*\(", "IIF(", query, flags=re.I)
+    return query.replace("%s", "?")
\ No newline at end of file
@@ -1,64 +1,347 @@
-import mysql.connector
-from mysql.connector import Error
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from mysql.connector.errors import PoolError
+from .backends import Error, MySQLBackend
+from .instrumentation import QueryProbe, QueryStats
 
 class Database:
-    def __init__(self):
-        self.host = 'localhost'
-        self.user = 'root'
-        self.password = ''
-        self.database = 'lms_db'
+    def __init__(self, pool_size=0, backend=None):
+        # MySQLBackend (the default) or SQLiteBackend; see database/backends.py.
+        self.backend = backend or MySQLBackend()
         self.connection = None
+        # pool_size = 0 keeps the original single shared connection.
+        self.pool_size = pool_size
+        self.pool_timeout = 30
+        # Connections idle for longer than this are pinged before reuse.
+        self.health_check_interval = 30
+        self._pool = None
+        self._last_used = {}
+        self._failed = set()
+        self._local = threading.local()
+        # Per-statement timings; set stats.slow_query_ms = None to disable the slow-query log.
+        self.stats = QueryStats()
+        # Callables run as tracer(query, params) before each statement (see tools/advisor.py).
+        self.tracers = []
 
-    def connect(self):
+    def _open(self):
+        return self.backend.connect()
+
+    def connect(self, pool_size=None):
+        if pool_size is not None:
+            self.pool_size = pool_size
         try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database
-            )
+            if self.pool_size:
+                self._pool = queue.LifoQueue(maxsize=self.pool_size)
+                for _ in range(self.pool_size):
+                    self._checkin(self._open())
+            else:
+                self.connection = self._open()
             return True
         except Error:
+            self.close()
             return False
 
-    def execute_query(self, query, params=None):
-        cursor = self.connection.cursor()
+    def _ensure_alive(self, connection):
+        """Ping connections that sat idle and reopen them if the server dropped them"""
+        last_used = self._last_used.get(id(connection), 0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return connection
         try:
-            cursor.execute(query, params)
-            self.connection.commit()
-
-            if query.strip().upper().startswith("INSERT"):
-                return cursor.lastrowid
-            else:
-                return cursor.rowcount
+            self.backend.ping(connection)
+            return connection
         except Error:
-            self.connection.rollback()
-            return None
-        finally:
-            cursor.close()
+            try:
+                connection.close()
+            except Error:
+                pass
+            return self._open()
 
-    def fetch_all(self, query, params=None):
-        cursor = self.connection.cursor()
+    def _checkout(self):
         try:
-            cursor.execute(query, params)
-            return cursor.fetchall()
+            connection = self._pool.get(timeout=self.pool_timeout)
+        except queue.Empty:
+            raise PoolError("No database connection available in the pool")
+        try:
+            return self._ensure_alive(connection)
         except Error:
-            return []
-        finally:
-            cursor.close()
+            # Keep the slot so the next checkout can retry the reconnect.
+            self._pool.put(connection)
+            raise
+
+    def _checkin(self, connection):
+        if id(connection) in self._failed:
+            # A driver error may mean the server dropped it: the next checkout pings it first.
+            self._failed.discard(id(connection))
+            self._last_used.pop(id(connection), None)
+        else:
+            self._last_used[id(connection)] = time.monotonic()
+        self._pool.put(connection)
+
+    def _expire(self, connection):
+        """Have the next checkout health-check this connection, however recently it was used"""
+        if self._pool is not None:
+            self._failed.add(id(connection))
+
+    @contextmanager
+    def session(self, isolated=False):
+        """
+        Pin one connection to the current thread for every call made inside the block.
+        With isolated=True the block never shares the connection already pinned to the thread,
+        so its commits stay independent of the caller's.
+        """
+        previous = getattr(self._local, 'connection', None)
+        if previous is not None and (not isolated or self.joins_transaction()):
+            yield previous
+            return
+        with self._connection(isolated) as connection:
+            self._local.connection = connection
+            try:
+                yield connection
+            finally:
+                self._local.connection = previous
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run every statement inside the block as one unit of work on a pinned connection.
+        Commits on exit and rolls back if the block raises; driver errors are raised instead of
+        swallowed so a failed step aborts the whole unit. A nested transaction joins the outer one.
+        """
+        if self.in_transaction():
+            yield self._local.connection
+            return
+        with self.session() as connection:
+            self.backend.begin(connection)
+            self._local.transaction = connection
+            self._local.on_rollback = []
+            try:
+                yield connection
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                for callback in self._local.on_rollback:
+                    callback()
+                raise
+            finally:
+                self._local.transaction = None
+                self._local.on_rollback = []
+
+    def on_rollback(self, callback):
+        """Run callback() if the thread's open transaction rolls back; ignored outside a transaction"""
+        if self.in_transaction():
+            self._local.on_rollback.append(callback)
+
+    def in_transaction(self):
+        transaction = getattr(self._local, 'transaction', None)
+        return transaction is not None and transaction is getattr(self._local, 'connection', None)
+
+    def joins_transaction(self):
+        """True when an isolated session would run inside the thread's open transaction"""
+        # Backends without concurrent writers would deadlock an isolated write against the
+        # thread's open transaction, so the isolated session runs inside it instead.
+        return self.in_transaction() and not self.backend.isolated_writes
+
+    @contextmanager
+    def _connection(self, isolated=False):
+        pinned = getattr(self._local, 'connection', None)
+        if pinned is not None and not isolated:
+            yield pinned
+        elif self._pool is not None:
+            connection = self._checkout()
+            try:
+                yield connection
+            except Error:
+                self._expire(connection)
+                raise
+            finally:
+                self._checkin(connection)
+        elif pinned is not None:
+            # Single-connection mode is already busy on this thread: use a short-lived one.
+            connection = self._open()
+            try:
+                yield connection
+            finally:
+                connection.close()
+        else:
+            yield self.connection
+
+    def _trace(self, query, params):
+        for tracer in self.tracers:
+            tracer(query, params)
+
+    def execute_query(self, query, params=None):
+        if self.tracers:
+            self._trace(query, params)
+        with self.stats.measure(query) as probe:
+            try:
+                with self._connection() as connection:
+                    cursor = self.backend.cursor(connection)
+                    try:
+                        cursor.execute(self.backend.translate(query), params or ())
+                        if not self.in_transaction():
+                            connection.commit()
+                        probe.rows = cursor.rowcount
+
+                        if query.strip().upper().startswith("INSERT"):
+                            return cursor.lastrowid
+                        else:
+                            return cursor.rowcount
+                    except Error as error:
+                        probe.error = error
+                        if self.in_transaction():
+                            raise
+                        self._expire(connection)
+                        connection.rollback()
+                        return None
+                    finally:
+                        cursor.close()
+            except Error as error:
+                probe.error = error
+                if self.in_transaction():
+                    raise
+                return None
+
+    def execute_many(self, query, seq_params):
+        """Run one statement over many parameter rows and commit them together (or with the transaction)"""
+        if self.tracers and seq_params:
+            self._trace(query, seq_params[0])
+        with self.stats.measure(query) as probe:
+            try:
+                with self._connection() as connection:
+                    cursor = self.backend.cursor(connection)
+                    try:
+                        cursor.executemany(self.backend.translate(query), seq_params)
+                        if not self.in_transaction():
+                            connection.commit()
+                        probe.rows = cursor.rowcount
+                        return cursor.rowcount
+                    except Error as error:
+                        probe.error = error
+                        if self.in_transaction():
+                            raise
+                        self._expire(connection)
+                        connection.rollback()
+                        return None
+                    finally:
+                        cursor.close()
+            except Error as error:
+                probe.error = error
+                if self.in_transaction():
+                    raise
+                return None
+
+    def fetch_all(self, query, params=None):
+        if self.tracers:
+            self._trace(query, params)
+        with self.stats.measure(query) as probe:
+            try:
+                with self._connection() as connection:
+                    cursor = self.backend.cursor(connection)
+                    try:
+                        cursor.execute(self.backend.translate(query), params or ())
+                        rows = cursor.fetchall()
+                        probe.rows = len(rows)
+                        return rows
+                    finally:
+                        cursor.close()
+            except Error as error:
+                probe.error = error
+                if self.in_transaction():
+                    raise
+                return []
 
     def fetch_one(self, query, params=None):
-        cursor = self.connection.cursor()
+        if self.tracers:
+            self._trace(query, params)
+        with self.stats.measure(query) as probe:
+            try:
+                with self._connection() as connection:
+                    cursor = self.backend.cursor(connection, buffered=True)
+                    try:
+                        cursor.execute(self.backend.translate(query), params or ())
+                        row = cursor.fetchone()
+                        probe.rows = 1 if row is not None else 0
+                        return row
+                    finally:
+                        cursor.close()
+            except Error as error:
+                probe.error = error
+                if self.in_transaction():
+                    raise
+                return None
+
+    def fetch_page(self, query, key, after=None, before=None, limit=20, params=()):
+        """
+        Keyset pagination: one indexed range scan per page instead of OFFSET or a full fetch.
+        query must not carry its own WHERE/ORDER BY. Pass after= for the next page or before=
+        for the previous one; rows always come back in ascending key order.
+        """
+        if before is not None:
+            rows = self.fetch_all(f"{query} WHERE {key} < %s ORDER BY {key} DESC LIMIT %s",
+                                  tuple(params) + (before, limit))
+            return rows[::-1]
+        return self.fetch_all(f"{query} WHERE {key} > %s ORDER BY {key} LIMIT %s",
+                              tuple(params) + (after if after is not None else 0, limit))
+
+    def iter_query(self, query, params=None, batch_size=500):
+        """
+        Stream rows from an unbuffered server-side cursor, fetching batch_size rows at a time.
+        The connection stays checked out until the generator is exhausted or closed; in
+        single-connection mode finish (or close) the generator before running other queries.
+        Only time spent inside the driver is recorded, not time the consumer holds each batch.
+        """
+        if self.tracers:
+            self._trace(query, params)
+        elapsed = 0.0
+        probe = QueryProbe()
         try:
-            cursor.execute(query, params)
-            return cursor.fetchone()
-        except Error:
-            return None
+            with self._connection() as connection:
+                cursor = self.backend.cursor(connection, buffered=False)
+                try:
+                    started = time.perf_counter()
+                    cursor.execute(self.backend.translate(query), params or ())
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        elapsed += time.perf_counter() - started
+                        if not rows:
+                            break
+                        probe.rows += len(rows)
+                        yield from rows
+                        started = time.perf_counter()
+                finally:
+                    # A generator closed early leaves rows on the wire; drain them so the
+                    # connection can be reused.
+                    self.backend.discard_unread(connection)
+                    cursor.close()
+        except Error as error:
+            probe.error = error
+            if self.in_transaction():
+                raise
+            return
         finally:
-            cursor.close()
+            self.stats.record(query, elapsed * 1000, probe.rows, probe.error)
+
+    def explain(self, query, params=None):
+        """The backend's plan for a statement as a list of dicts, one per plan row; driver errors are raised"""
+        with self._connection() as connection:
+            return self.backend.explain(connection, self.backend.translate(query), params or ())
 
     def close(self):
         if self.connection:
             self.connection.close()
+            self.connection = None
+        if self._pool is not None:
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+                except Error:
+                    pass
+            self._pool = None
+            self._last_used.clear()
+            self._failed.clear()
 
 db = Database()
\ No newline at end of file
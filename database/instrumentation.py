@@ -0,0 +1,144 @@
+import bisect
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+
+logger = logging.getLogger('lms.db')
+logger.addHandler(logging.NullHandler())
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the last bucket is open-ended.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def configure_logging(path=None, stream=None):
+    """
+    Send the 'lms' loggers (failed and slow queries, server and load-test errors) to a file,
+    to a stream such as sys.stderr, or both. Without either they are dropped.
+    """
+    root = logging.getLogger('lms')
+    root.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    handlers = []
+    if path:
+        handlers.append(logging.FileHandler(path, encoding='utf-8'))
+    if stream is not None:
+        handlers.append(logging.StreamHandler(stream))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    return handlers
+
+@lru_cache(maxsize=1024)
+def fingerprint(query):
+    """Normalize a statement so calls that differ only in literals or IN-list length share stats"""
+    normalized = re.sub(r"'(?:[^'\\]|\\.|'')*'", "?", query)
+    normalized = re.sub(r"\b\d+(?:\.\d+)?\b", "?", normalized)
+    normalized = normalized.replace("%s", "?")
+    normalized = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", normalized)
+    return re.sub(r"\s+", " ", normalized).strip()
+
+def caller(frame=None):
+    """file:line of the first stack frame outside the database package, from frame (default: the caller's)"""
+    frame = frame or sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(_PACKAGE_DIR) and 'contextlib' not in filename:
+            return f"{os.path.relpath(filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+class StatementStats:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, elapsed_ms, rows, failed):
+        self.calls += 1
+        self.errors += 1 if failed else 0
+        self.rows += rows or 0
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def percentile_ms(self, p):
+        """Upper bound of the histogram bucket holding the p-th percentile (max_ms for the open bucket)"""
+        rank = p / 100 * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + (None,), self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max_ms) if bound is not None else self.max_ms
+        return self.max_ms
+
+class QueryProbe:
+    def __init__(self):
+        self.rows = 0
+        self.error = None
+
+class QueryStats:
+    """Per-fingerprint latency histograms, row and error counts, plus a slow-query log"""
+    def __init__(self, slow_query_ms=500, slow_log_size=50):
+        self.slow_query_ms = slow_query_ms
+        self.listeners = []
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, query):
+        probe = QueryProbe()
+        started = time.perf_counter()
+        try:
+            yield probe
+        finally:
+            self.record(query, (time.perf_counter() - started) * 1000, probe.rows, probe.error)
+
+    def record(self, query, elapsed_ms, rows=0, error=None):
+        key = fingerprint(query)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats(key)
+            stats.add(elapsed_ms, rows, error is not None)
+
+        if error is not None:
+            logger.warning("Query failed at %s: %s (%s)", caller(), key, error)
+        if self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms:
+            origin = caller()
+            self.slow_queries.append((time.time(), elapsed_ms, origin, key))
+            logger.warning("Slow query (%.1f ms) at %s: %s", elapsed_ms, origin, key)
+        for listener in self.listeners:
+            listener(key, elapsed_ms, rows, error)
+
+    def snapshot(self):
+        """StatementStats for every fingerprint, slowest total time first"""
+        with self._lock:
+            return sorted(self._stats.values(), key=lambda s: s.total_ms, reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+        self.slow_queries.clear()
+
+    def report(self, limit=20):
+        lines = [f"{'calls':>7} {'errors':>6} {'rows':>8} {'mean ms':>8} {'p95 ms':>8} {'max ms':>8}  statement"]
+        for stats in self.snapshot()[:limit]:
+            lines.append(f"{stats.calls:>7} {stats.errors:>6} {stats.rows:>8} {stats.mean_ms:>8.2f} "
+                         f"{stats.percentile_ms(95):>8.2f} {stats.max_ms:>8.2f}  {stats.fingerprint[:100]}")
+        return "\n".join(lines)
\ No newline at end of file
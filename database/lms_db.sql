@@ -21,6 +21,25 @@ SET time_zone = "+00:00";
 -- Database: `lms_db`
 --
 
+DELIMITER $$
+--
+-- Procedures
+--
+CREATE PROCEDURE `grade_summary_apply` (IN `p_enrollment_id` INT, IN `p_grade` DECIMAL(5,2), IN `p_sign` INT)   BEGIN
+  IF p_grade IS NOT NULL THEN
+    INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+    SELECT `subject_id`, p_sign, p_sign * p_grade, IF(p_grade >= 75, p_sign, 0), IF(p_grade < 75, p_sign, 0)
+    FROM `enrollments` WHERE `id` = p_enrollment_id
+    ON DUPLICATE KEY UPDATE
+      `graded_count` = `graded_count` + VALUES(`graded_count`),
+      `grade_sum` = `grade_sum` + VALUES(`grade_sum`),
+      `passed_count` = `passed_count` + VALUES(`passed_count`),
+      `failed_count` = `failed_count` + VALUES(`failed_count`);
+  END IF;
+END$$
+
+DELIMITER ;
+
 -- --------------------------------------------------------
 
 --
@@ -86,6 +105,27 @@ INSERT INTO `enrollments` (`id`, `student_id`, `subject_id`, `status`, `enrolled
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `grade_summary`
+--
+
+CREATE TABLE `grade_summary` (
+  `subject_id` int(11) NOT NULL,
+  `graded_count` int(11) NOT NULL DEFAULT 0,
+  `grade_sum` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `passed_count` int(11) NOT NULL DEFAULT 0,
+  `failed_count` int(11) NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+--
+-- Dumping data for table `grade_summary`
+--
+
+INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`) VALUES
+(3, 1, 92.80, 1, 0);
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `grades`
 --
@@ -113,6 +153,66 @@ CREATE TABLE `grades` (
 INSERT INTO `grades` (`id`, `enrollment_id`, `grade`, `activity_score`, `quiz_score`, `exam_score`, `activity_weight`, `quiz_weight`, `exam_weight`, `final_grade`, `is_component_based`, `remarks`, `created_at`) VALUES
 (4, 7, NULL, 90.00, 94.00, 95.00, 40.00, 20.00, 40.00, 92.80, 1, 'Passed', '2025-06-26 14:05:48');
 
+--
+-- Triggers `grades`
+--
+DELIMITER $$
+CREATE TRIGGER `grades_summary_delete` AFTER DELETE ON `grades` FOR EACH ROW CALL grade_summary_apply(OLD.enrollment_id, IF(OLD.is_component_based = 1, OLD.final_grade, OLD.grade), -1)
+$$
+DELIMITER ;
+DELIMITER $$
+CREATE TRIGGER `grades_summary_insert` AFTER INSERT ON `grades` FOR EACH ROW CALL grade_summary_apply(NEW.enrollment_id, IF(NEW.is_component_based = 1, NEW.final_grade, NEW.grade), 1)
+$$
+DELIMITER ;
+DELIMITER $$
+CREATE TRIGGER `grades_summary_update` AFTER UPDATE ON `grades` FOR EACH ROW BEGIN
+  CALL grade_summary_apply(OLD.enrollment_id, IF(OLD.is_component_based = 1, OLD.final_grade, OLD.grade), -1);
+  CALL grade_summary_apply(NEW.enrollment_id, IF(NEW.is_component_based = 1, NEW.final_grade, NEW.grade), 1);
+END
+$$
+DELIMITER ;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `id_sequences`
+--
+
+CREATE TABLE `id_sequences` (
+  `name` varchar(50) NOT NULL,
+  `next_value` int(11) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+--
+-- Dumping data for table `id_sequences`
+--
+
+INSERT INTO `id_sequences` (`name`, `next_value`) VALUES
+('user_id', 100000);
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `schema_migrations`
+--
+
+CREATE TABLE `schema_migrations` (
+  `version` int(11) NOT NULL,
+  `name` varchar(100) NOT NULL,
+  `applied_at` timestamp NOT NULL DEFAULT current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+--
+-- Dumping data for table `schema_migrations`
+--
+
+INSERT INTO `schema_migrations` (`version`, `name`, `applied_at`) VALUES
+(1, 'grades_unique_enrollment', '2025-06-26 16:09:00'),
+(2, 'id_sequences', '2025-06-26 16:09:00'),
+(3, 'grade_summary', '2025-06-26 16:09:00'),
+(4, 'subject_capacity', '2025-06-26 16:09:00'),
+(5, 'enrollment_status_indexes', '2025-06-26 16:09:00');
+
 -- --------------------------------------------------------
 
 --
@@ -149,16 +249,18 @@ CREATE TABLE `subjects` (
   `name` varchar(100) NOT NULL,
   `description` text DEFAULT NULL,
   `teacher_id` int(11) DEFAULT NULL,
-  `course_id` int(11) DEFAULT NULL
+  `course_id` int(11) DEFAULT NULL,
+  `capacity` int(11) DEFAULT NULL,
+  `seats_taken` int(11) NOT NULL DEFAULT 0
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 --
 -- Dumping data for table `subjects`
 --
 
-INSERT INTO `subjects` (`id`, `code`, `name`, `description`, `teacher_id`, `course_id`) VALUES
-(3, '5', 'Dark Psychology', 'Manipulation 101', 1, 5),
-(4, '1', 'Software Engineering 1', 'Making Sofltware', 1, 1);
+INSERT INTO `subjects` (`id`, `code`, `name`, `description`, `teacher_id`, `course_id`, `capacity`, `seats_taken`) VALUES
+(3, '5', 'Dark Psychology', 'Manipulation 101', 1, 5, NULL, 1),
+(4, '1', 'Software Engineering 1', 'Making Sofltware', 1, 1, NULL, 0);
 
 -- --------------------------------------------------------
 
@@ -207,14 +309,33 @@ ALTER TABLE `courses`
 ALTER TABLE `enrollments`
   ADD PRIMARY KEY (`id`),
   ADD UNIQUE KEY `unique_enrollment` (`student_id`,`subject_id`),
-  ADD KEY `subject_id` (`subject_id`);
+  ADD KEY `subject_status` (`subject_id`,`status`),
+  ADD KEY `student_status` (`student_id`,`status`);
+
+--
+-- Indexes for table `grade_summary`
+--
+ALTER TABLE `grade_summary`
+  ADD PRIMARY KEY (`subject_id`);
 
 --
 -- Indexes for table `grades`
 --
 ALTER TABLE `grades`
   ADD PRIMARY KEY (`id`),
-  ADD KEY `enrollment_id` (`enrollment_id`);
+  ADD UNIQUE KEY `enrollment_id` (`enrollment_id`);
+
+--
+-- Indexes for table `id_sequences`
+--
+ALTER TABLE `id_sequences`
+  ADD PRIMARY KEY (`name`);
+
+--
+-- Indexes for table `schema_migrations`
+--
+ALTER TABLE `schema_migrations`
+  ADD PRIMARY KEY (`version`);
 
 --
 -- Indexes for table `students`
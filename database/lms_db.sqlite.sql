@@ -0,0 +1,185 @@
+-- SQLite translation of lms_db.sql for the embedded backend (database/backends.py).
+-- Keep table definitions, keys and seed rows in step with the MySQL dump.
+
+CREATE TABLE `admins` (
+  `id` INTEGER PRIMARY KEY,
+  `user_id` varchar(6) NOT NULL UNIQUE,
+  `name` varchar(100) NOT NULL,
+  `email` varchar(100) NOT NULL UNIQUE,
+  `password` varchar(255) NOT NULL
+);
+
+INSERT INTO `admins` (`id`, `user_id`, `name`, `email`, `password`) VALUES
+(1, '000001', 'System Admin', 'admin@lms.com', 'admin123');
+
+CREATE TABLE `courses` (
+  `id` INTEGER PRIMARY KEY,
+  `name` varchar(100) NOT NULL UNIQUE,
+  `description` text DEFAULT NULL
+);
+
+INSERT INTO `courses` (`id`, `name`, `description`) VALUES
+(1, 'Computer Science', 'Bachelor of Science in Computer Science'),
+(2, 'Information Technology', 'Bachelor of Science in Information Technology'),
+(5, 'Psycho', 'Bachelor of Science in Psychology');
+
+CREATE TABLE `teachers` (
+  `id` INTEGER PRIMARY KEY,
+  `user_id` varchar(6) NOT NULL UNIQUE,
+  `name` varchar(100) NOT NULL,
+  `email` varchar(100) NOT NULL UNIQUE,
+  `password` varchar(255) NOT NULL,
+  `position` varchar(100) DEFAULT NULL
+);
+
+INSERT INTO `teachers` (`id`, `user_id`, `name`, `email`, `password`, `position`) VALUES
+(1, '954273', 'Iana Cappuchina', 'iana@gmail.com', '111111', 'CyberSec Instructor');
+
+CREATE TABLE `students` (
+  `id` INTEGER PRIMARY KEY,
+  `user_id` varchar(6) NOT NULL UNIQUE,
+  `name` varchar(100) NOT NULL,
+  `email` varchar(100) NOT NULL UNIQUE,
+  `password` varchar(255) NOT NULL,
+  `course_id` int(11) DEFAULT NULL REFERENCES `courses` (`id`),
+  `year_level` int(11) DEFAULT NULL
+);
+CREATE INDEX `students_course_id` ON `students` (`course_id`);
+
+INSERT INTO `students` (`id`, `user_id`, `name`, `email`, `password`, `course_id`, `year_level`) VALUES
+(2, '301547', 'Ianny', 'ianny@gmail.com', '123', 1, 4),
+(5, '745328', 'TAE', 'tae@gmail.com', '123', 2, 3);
+
+CREATE TABLE `subjects` (
+  `id` INTEGER PRIMARY KEY,
+  `code` varchar(20) NOT NULL UNIQUE,
+  `name` varchar(100) NOT NULL,
+  `description` text DEFAULT NULL,
+  `teacher_id` int(11) DEFAULT NULL REFERENCES `teachers` (`id`),
+  `course_id` int(11) DEFAULT NULL REFERENCES `courses` (`id`),
+  `capacity` int(11) DEFAULT NULL,
+  `seats_taken` int(11) NOT NULL DEFAULT 0
+);
+CREATE INDEX `subjects_teacher_id` ON `subjects` (`teacher_id`);
+CREATE INDEX `subjects_course_id` ON `subjects` (`course_id`);
+
+INSERT INTO `subjects` (`id`, `code`, `name`, `description`, `teacher_id`, `course_id`, `capacity`, `seats_taken`) VALUES
+(3, '5', 'Dark Psychology', 'Manipulation 101', 1, 5, NULL, 1),
+(4, '1', 'Software Engineering 1', 'Making Sofltware', 1, 1, NULL, 0);
+
+CREATE TABLE `enrollments` (
+  `id` INTEGER PRIMARY KEY,
+  `student_id` int(11) DEFAULT NULL REFERENCES `students` (`id`),
+  `subject_id` int(11) DEFAULT NULL REFERENCES `subjects` (`id`),
+  `status` text DEFAULT 'pending' CHECK (`status` IN ('pending', 'approved', 'denied')),
+  `enrolled_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE (`student_id`, `subject_id`)
+);
+CREATE INDEX `enrollments_subject_status` ON `enrollments` (`subject_id`, `status`);
+CREATE INDEX `enrollments_student_status` ON `enrollments` (`student_id`, `status`);
+
+INSERT INTO `enrollments` (`id`, `student_id`, `subject_id`, `status`, `enrolled_at`) VALUES
+(7, 5, 3, 'approved', '2025-06-26 14:03:55');
+
+CREATE TABLE `grades` (
+  `id` INTEGER PRIMARY KEY,
+  `enrollment_id` int(11) DEFAULT NULL REFERENCES `enrollments` (`id`),
+  `grade` decimal(5,2) DEFAULT NULL,
+  `activity_score` decimal(5,2) DEFAULT NULL,
+  `quiz_score` decimal(5,2) DEFAULT NULL,
+  `exam_score` decimal(5,2) DEFAULT NULL,
+  `activity_weight` decimal(5,2) DEFAULT 40.00,
+  `quiz_weight` decimal(5,2) DEFAULT 20.00,
+  `exam_weight` decimal(5,2) DEFAULT 40.00,
+  `final_grade` decimal(5,2) DEFAULT NULL,
+  `is_component_based` tinyint(1) DEFAULT 0,
+  `remarks` text DEFAULT NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE UNIQUE INDEX `grades_enrollment_id` ON `grades` (`enrollment_id`);
+
+INSERT INTO `grades` (`id`, `enrollment_id`, `grade`, `activity_score`, `quiz_score`, `exam_score`, `activity_weight`, `quiz_weight`, `exam_weight`, `final_grade`, `is_component_based`, `remarks`, `created_at`) VALUES
+(4, 7, NULL, 90.00, 94.00, 95.00, 40.00, 20.00, 40.00, 92.80, 1, 'Passed', '2025-06-26 14:05:48');
+
+CREATE TABLE `grade_summary` (
+  `subject_id` INTEGER PRIMARY KEY,
+  `graded_count` int(11) NOT NULL DEFAULT 0,
+  `grade_sum` real NOT NULL DEFAULT 0,
+  `passed_count` int(11) NOT NULL DEFAULT 0,
+  `failed_count` int(11) NOT NULL DEFAULT 0
+);
+
+INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`) VALUES
+(3, 1, 92.80, 1, 0);
+
+-- SQLite has no stored procedures, so each trigger inlines grade_summary_apply.
+CREATE TRIGGER `grades_summary_insert` AFTER INSERT ON `grades` BEGIN
+  INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+  SELECT `subject_id`, 1, `value`, `value` >= 75, `value` < 75
+  FROM (SELECT e.`subject_id`, CASE WHEN NEW.`is_component_based` = 1 THEN NEW.`final_grade` ELSE NEW.`grade` END AS `value`
+        FROM `enrollments` e WHERE e.`id` = NEW.`enrollment_id`)
+  WHERE `value` IS NOT NULL
+  ON CONFLICT (`subject_id`) DO UPDATE SET
+    `graded_count` = `graded_count` + excluded.`graded_count`,
+    `grade_sum` = `grade_sum` + excluded.`grade_sum`,
+    `passed_count` = `passed_count` + excluded.`passed_count`,
+    `failed_count` = `failed_count` + excluded.`failed_count`;
+END;
+
+CREATE TRIGGER `grades_summary_delete` AFTER DELETE ON `grades` BEGIN
+  INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+  SELECT `subject_id`, -1, -`value`, -(`value` >= 75), -(`value` < 75)
+  FROM (SELECT e.`subject_id`, CASE WHEN OLD.`is_component_based` = 1 THEN OLD.`final_grade` ELSE OLD.`grade` END AS `value`
+        FROM `enrollments` e WHERE e.`id` = OLD.`enrollment_id`)
+  WHERE `value` IS NOT NULL
+  ON CONFLICT (`subject_id`) DO UPDATE SET
+    `graded_count` = `graded_count` + excluded.`graded_count`,
+    `grade_sum` = `grade_sum` + excluded.`grade_sum`,
+    `passed_count` = `passed_count` + excluded.`passed_count`,
+    `failed_count` = `failed_count` + excluded.`failed_count`;
+END;
+
+CREATE TRIGGER `grades_summary_update` AFTER UPDATE ON `grades` BEGIN
+  INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+  SELECT `subject_id`, -1, -`value`, -(`value` >= 75), -(`value` < 75)
+  FROM (SELECT e.`subject_id`, CASE WHEN OLD.`is_component_based` = 1 THEN OLD.`final_grade` ELSE OLD.`grade` END AS `value`
+        FROM `enrollments` e WHERE e.`id` = OLD.`enrollment_id`)
+  WHERE `value` IS NOT NULL
+  ON CONFLICT (`subject_id`) DO UPDATE SET
+    `graded_count` = `graded_count` + excluded.`graded_count`,
+    `grade_sum` = `grade_sum` + excluded.`grade_sum`,
+    `passed_count` = `passed_count` + excluded.`passed_count`,
+    `failed_count` = `failed_count` + excluded.`failed_count`;
+  INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+  SELECT `subject_id`, 1, `value`, `value` >= 75, `value` < 75
+  FROM (SELECT e.`subject_id`, CASE WHEN NEW.`is_component_based` = 1 THEN NEW.`final_grade` ELSE NEW.`grade` END AS `value`
+        FROM `enrollments` e WHERE e.`id` = NEW.`enrollment_id`)
+  WHERE `value` IS NOT NULL
+  ON CONFLICT (`subject_id`) DO UPDATE SET
+    `graded_count` = `graded_count` + excluded.`graded_count`,
+    `grade_sum` = `grade_sum` + excluded.`grade_sum`,
+    `passed_count` = `passed_count` + excluded.`passed_count`,
+    `failed_count` = `failed_count` + excluded.`failed_count`;
+END;
+
+CREATE TABLE `id_sequences` (
+  `name` varchar(50) NOT NULL PRIMARY KEY,
+  `next_value` int(11) NOT NULL
+);
+
+INSERT INTO `id_sequences` (`name`, `next_value`) VALUES
+('user_id', 100000);
+
+-- Migrations already contained in this schema (see database/migrate.py).
+CREATE TABLE `schema_migrations` (
+  `version` INTEGER PRIMARY KEY,
+  `name` varchar(100) NOT NULL,
+  `applied_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO `schema_migrations` (`version`, `name`) VALUES
+(1, 'grades_unique_enrollment'),
+(2, 'id_sequences'),
+(3, 'grade_summary'),
+(4, 'subject_capacity'),
+(5, 'enrollment_status_indexes');
@@ -0,0 +1,121 @@
+import os
+import re
+from .backends import Error
+from .connection import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+class Migration:
+    def __init__(self, version, name):
+        self.version = version
+        self.name = name
+        self.scripts = {}
+
+    def script(self, backend, direction):
+        path = self.scripts.get((backend, direction))
+        if path is None:
+            raise RuntimeError(f"Migration {self.version:04d}_{self.name} has no {direction} script for {backend}")
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+class Migrator:
+    """
+    Versioned schema changes on top of the original lms_db.sql dump (version 0). Each migration is
+    a pair of scripts in database/migrations named NNNN_name.BACKEND.up.sql / .down.sql; applied
+    versions are recorded in schema_migrations. Both shipped schema files already contain every
+    migration and are stamped accordingly. The MySQL scripts use MariaDB's IF [NOT] EXISTS forms,
+    so a database that already has part of a change can still be brought up to date.
+    """
+    TABLE_QUERY = """CREATE TABLE IF NOT EXISTS schema_migrations (
+                     version int NOT NULL PRIMARY KEY,
+                     name varchar(100) NOT NULL,
+                     applied_at timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP)"""
+    FILENAME = re.compile(r"^(\d+)_(\w+)\.(\w+)\.(up|down)\.sql$")
+
+    def __init__(self, directory=MIGRATIONS_DIR):
+        self.directory = directory
+
+    def migrations(self):
+        """Every migration on disk, oldest first"""
+        found = {}
+        for filename in os.listdir(self.directory):
+            match = self.FILENAME.match(filename)
+            if not match:
+                continue
+            version, name, backend, direction = match.groups()
+            migration = found.setdefault(int(version), Migration(int(version), name))
+            migration.scripts[(backend, direction)] = os.path.join(self.directory, filename)
+        return [found[version] for version in sorted(found)]
+
+    def applied(self):
+        """{version: (name, applied_at)} for the migrations recorded in the database"""
+        db.execute_query(self.TABLE_QUERY)
+        return {row[0]: (row[1], row[2]) for row in db.fetch_all("SELECT version, name, applied_at FROM schema_migrations")}
+
+    def current(self):
+        applied = self.applied()
+        return max(applied) if applied else 0
+
+    def status(self):
+        """(version, name, applied_at or None) for every migration on disk"""
+        applied = self.applied()
+        return [(m.version, m.name, applied.get(m.version, (None, None))[1]) for m in self.migrations()]
+
+    def migrate(self, target=None, progress=None):
+        """
+        Apply pending migrations up to target (the latest by default), or roll applied ones back
+        down to target when it is lower. Returns the (direction, migration) steps taken.
+        """
+        migrations = self.migrations()
+        applied = self.applied()
+        if target is None:
+            target = migrations[-1].version if migrations else 0
+        steps = [('up', m) for m in migrations if m.version <= target and m.version not in applied]
+        steps += [('down', m) for m in reversed(migrations) if m.version > target and m.version in applied]
+        for direction, migration in steps:
+            if progress:
+                progress(direction, migration)
+            self._run(migration, direction)
+        return steps
+
+    def _run(self, migration, direction):
+        statements = self.split(migration.script(db.backend.name, direction))
+        try:
+            # MySQL commits DDL implicitly, so only SQLite gets an all-or-nothing migration;
+            # the MySQL scripts are written to be safe to re-run after a partial failure.
+            with db.transaction():
+                for statement in statements:
+                    db.execute_query(statement)
+                if direction == 'up':
+                    db.execute_query("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                                     (migration.version, migration.name))
+                else:
+                    db.execute_query("DELETE FROM schema_migrations WHERE version = %s", (migration.version,))
+        except Error as error:
+            raise RuntimeError(f"Migration {migration.version:04d}_{migration.name} ({direction}) failed: {error}") from error
+
+    @staticmethod
+    def split(script):
+        """
+        Break a script into statements on ';', honouring mysql-client style DELIMITER lines so
+        procedure and trigger bodies stay whole. Full-line '--' comments are dropped.
+        """
+        statements = []
+        delimiter = ';'
+        current = []
+        for line in script.splitlines():
+            stripped = line.strip()
+            if not current and (not stripped or stripped.startswith('--')):
+                continue
+            if stripped.upper().startswith('DELIMITER '):
+                delimiter = stripped.split(None, 1)[1]
+                continue
+            current.append(line)
+            if stripped.endswith(delimiter):
+                statement = "\n".join(current).strip()[:-len(delimiter)].strip()
+                if statement:
+                    statements.append(statement)
+                current = []
+        if "\n".join(current).strip():
+            statements.append("\n".join(current).strip())
+        return statements
\ No newline at end of file
@@ -0,0 +1,3 @@
+ALTER TABLE `grades`
+  DROP INDEX `enrollment_id`,
+  ADD KEY `enrollment_id` (`enrollment_id`);
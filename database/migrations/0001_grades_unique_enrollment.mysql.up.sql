@@ -0,0 +1,8 @@
+-- One grade row per enrollment, so grades can be upserted with ON DUPLICATE KEY UPDATE.
+-- Keep the newest row where the old insert-or-update race left duplicates.
+DELETE g FROM `grades` g
+  JOIN `grades` newer ON newer.`enrollment_id` = g.`enrollment_id` AND newer.`id` > g.`id`;
+
+ALTER TABLE `grades`
+  DROP INDEX IF EXISTS `enrollment_id`,
+  ADD UNIQUE KEY `enrollment_id` (`enrollment_id`);
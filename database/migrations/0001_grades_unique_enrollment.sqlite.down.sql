@@ -0,0 +1,3 @@
+DROP INDEX IF EXISTS `grades_enrollment_id`;
+
+CREATE INDEX IF NOT EXISTS `grades_enrollment_id_fk` ON `grades` (`enrollment_id`);
@@ -0,0 +1,5 @@
+DELETE FROM `grades`
+WHERE EXISTS (SELECT 1 FROM `grades` newer WHERE newer.`enrollment_id` = `grades`.`enrollment_id` AND newer.`id` > `grades`.`id`);
+
+DROP INDEX IF EXISTS `grades_enrollment_id_fk`;
+CREATE UNIQUE INDEX IF NOT EXISTS `grades_enrollment_id` ON `grades` (`enrollment_id`);
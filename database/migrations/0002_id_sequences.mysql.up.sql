@@ -0,0 +1,9 @@
+-- Block allocator for 6-digit user IDs (models/user.py UserIdAllocator).
+CREATE TABLE IF NOT EXISTS `id_sequences` (
+  `name` varchar(50) NOT NULL,
+  `next_value` int(11) NOT NULL,
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+INSERT IGNORE INTO `id_sequences` (`name`, `next_value`) VALUES
+('user_id', 100000);
@@ -0,0 +1 @@
+DROP TABLE IF EXISTS `id_sequences`;
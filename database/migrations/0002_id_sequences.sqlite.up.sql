@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS `id_sequences` (
+  `name` varchar(50) NOT NULL PRIMARY KEY,
+  `next_value` int(11) NOT NULL
+);
+
+INSERT OR IGNORE INTO `id_sequences` (`name`, `next_value`) VALUES
+('user_id', 100000);
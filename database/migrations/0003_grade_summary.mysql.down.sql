@@ -0,0 +1,5 @@
+DROP TRIGGER IF EXISTS `grades_summary_update`;
+DROP TRIGGER IF EXISTS `grades_summary_insert`;
+DROP TRIGGER IF EXISTS `grades_summary_delete`;
+DROP PROCEDURE IF EXISTS `grade_summary_apply`;
+DROP TABLE IF EXISTS `grade_summary`;
@@ -0,0 +1,46 @@
+-- Per-subject grade totals kept current by triggers (models/grade.py get_grade_statistics).
+CREATE TABLE IF NOT EXISTS `grade_summary` (
+  `subject_id` int(11) NOT NULL,
+  `graded_count` int(11) NOT NULL DEFAULT 0,
+  `grade_sum` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `passed_count` int(11) NOT NULL DEFAULT 0,
+  `failed_count` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`subject_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+DELIMITER $$
+CREATE OR REPLACE PROCEDURE `grade_summary_apply` (IN `p_enrollment_id` INT, IN `p_grade` DECIMAL(5,2), IN `p_sign` INT)   BEGIN
+  IF p_grade IS NOT NULL THEN
+    INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+    SELECT `subject_id`, p_sign, p_sign * p_grade, IF(p_grade >= 75, p_sign, 0), IF(p_grade < 75, p_sign, 0)
+    FROM `enrollments` WHERE `id` = p_enrollment_id
+    ON DUPLICATE KEY UPDATE
+      `graded_count` = `graded_count` + VALUES(`graded_count`),
+      `grade_sum` = `grade_sum` + VALUES(`grade_sum`),
+      `passed_count` = `passed_count` + VALUES(`passed_count`),
+      `failed_count` = `failed_count` + VALUES(`failed_count`);
+  END IF;
+END$$
+
+CREATE OR REPLACE TRIGGER `grades_summary_delete` AFTER DELETE ON `grades` FOR EACH ROW CALL grade_summary_apply(OLD.enrollment_id, IF(OLD.is_component_based = 1, OLD.final_grade, OLD.grade), -1)
+$$
+
+CREATE OR REPLACE TRIGGER `grades_summary_insert` AFTER INSERT ON `grades` FOR EACH ROW CALL grade_summary_apply(NEW.enrollment_id, IF(NEW.is_component_based = 1, NEW.final_grade, NEW.grade), 1)
+$$
+
+CREATE OR REPLACE TRIGGER `grades_summary_update` AFTER UPDATE ON `grades` FOR EACH ROW BEGIN
+  CALL grade_summary_apply(OLD.enrollment_id, IF(OLD.is_component_based = 1, OLD.final_grade, OLD.grade), -1);
+  CALL grade_summary_apply(NEW.enrollment_id, IF(NEW.is_component_based = 1, NEW.final_grade, NEW.grade), 1);
+END
+$$
+DELIMITER ;
+
+-- Start from the grades already stored; the triggers keep it current from here.
+DELETE FROM `grade_summary`;
+
+INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+SELECT t.`subject_id`, COUNT(*), SUM(t.`value`), SUM(t.`value` >= 75), SUM(t.`value` < 75)
+FROM (SELECT e.`subject_id`, IF(g.`is_component_based` = 1, g.`final_grade`, g.`grade`) AS `value`
+      FROM `grades` g JOIN `enrollments` e ON g.`enrollment_id` = e.`id`) t
+WHERE t.`value` IS NOT NULL
+GROUP BY t.`subject_id`;
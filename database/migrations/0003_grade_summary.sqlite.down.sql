@@ -0,0 +1,4 @@
+DROP TRIGGER IF EXISTS `grades_summary_update`;
+DROP TRIGGER IF EXISTS `grades_summary_insert`;
+DROP TRIGGER IF EXISTS `grades_summary_delete`;
+DROP TABLE IF EXISTS `grade_summary`;
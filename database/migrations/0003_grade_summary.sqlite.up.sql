@@ -0,0 +1,73 @@
+-- Per-subject grade totals kept current by triggers (models/grade.py get_grade_statistics).
+CREATE TABLE IF NOT EXISTS `grade_summary` (
+  `subject_id` INTEGER PRIMARY KEY,
+  `graded_count` int(11) NOT NULL DEFAULT 0,
+  `grade_sum` real NOT NULL DEFAULT 0,
+  `passed_count` int(11) NOT NULL DEFAULT 0,
+  `failed_count` int(11) NOT NULL DEFAULT 0
+);
+
+-- SQLite has no stored procedures, so each trigger inlines grade_summary_apply.
+DELIMITER $$
+DROP TRIGGER IF EXISTS `grades_summary_insert`$$
+CREATE TRIGGER `grades_summary_insert` AFTER INSERT ON `grades` BEGIN
+  INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+  SELECT `subject_id`, 1, `value`, `value` >= 75, `value` < 75
+  FROM (SELECT e.`subject_id`, CASE WHEN NEW.`is_component_based` = 1 THEN NEW.`final_grade` ELSE NEW.`grade` END AS `value`
+        FROM `enrollments` e WHERE e.`id` = NEW.`enrollment_id`)
+  WHERE `value` IS NOT NULL
+  ON CONFLICT (`subject_id`) DO UPDATE SET
+    `graded_count` = `graded_count` + excluded.`graded_count`,
+    `grade_sum` = `grade_sum` + excluded.`grade_sum`,
+    `passed_count` = `passed_count` + excluded.`passed_count`,
+    `failed_count` = `failed_count` + excluded.`failed_count`;
+END$$
+
+DROP TRIGGER IF EXISTS `grades_summary_delete`$$
+CREATE TRIGGER `grades_summary_delete` AFTER DELETE ON `grades` BEGIN
+  INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+  SELECT `subject_id`, -1, -`value`, -(`value` >= 75), -(`value` < 75)
+  FROM (SELECT e.`subject_id`, CASE WHEN OLD.`is_component_based` = 1 THEN OLD.`final_grade` ELSE OLD.`grade` END AS `value`
+        FROM `enrollments` e WHERE e.`id` = OLD.`enrollment_id`)
+  WHERE `value` IS NOT NULL
+  ON CONFLICT (`subject_id`) DO UPDATE SET
+    `graded_count` = `graded_count` + excluded.`graded_count`,
+    `grade_sum` = `grade_sum` + excluded.`grade_sum`,
+    `passed_count` = `passed_count` + excluded.`passed_count`,
+    `failed_count` = `failed_count` + excluded.`failed_count`;
+END$$
+
+DROP TRIGGER IF EXISTS `grades_summary_update`$$
+CREATE TRIGGER `grades_summary_update` AFTER UPDATE ON `grades` BEGIN
+  INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+  SELECT `subject_id`, -1, -`value`, -(`value` >= 75), -(`value` < 75)
+  FROM (SELECT e.`subject_id`, CASE WHEN OLD.`is_component_based` = 1 THEN OLD.`final_grade` ELSE OLD.`grade` END AS `value`
+        FROM `enrollments` e WHERE e.`id` = OLD.`enrollment_id`)
+  WHERE `value` IS NOT NULL
+  ON CONFLICT (`subject_id`) DO UPDATE SET
+    `graded_count` = `graded_count` + excluded.`graded_count`,
+    `grade_sum` = `grade_sum` + excluded.`grade_sum`,
+    `passed_count` = `passed_count` + excluded.`passed_count`,
+    `failed_count` = `failed_count` + excluded.`failed_count`;
+  INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+  SELECT `subject_id`, 1, `value`, `value` >= 75, `value` < 75
+  FROM (SELECT e.`subject_id`, CASE WHEN NEW.`is_component_based` = 1 THEN NEW.`final_grade` ELSE NEW.`grade` END AS `value`
+        FROM `enrollments` e WHERE e.`id` = NEW.`enrollment_id`)
+  WHERE `value` IS NOT NULL
+  ON CONFLICT (`subject_id`) DO UPDATE SET
+    `graded_count` = `graded_count` + excluded.`graded_count`,
+    `grade_sum` = `grade_sum` + excluded.`grade_sum`,
+    `passed_count` = `passed_count` + excluded.`passed_count`,
+    `failed_count` = `failed_count` + excluded.`failed_count`;
+END$$
+DELIMITER ;
+
+-- Start from the grades already stored; the triggers keep it current from here.
+DELETE FROM `grade_summary`;
+
+INSERT INTO `grade_summary` (`subject_id`, `graded_count`, `grade_sum`, `passed_count`, `failed_count`)
+SELECT t.`subject_id`, COUNT(*), SUM(t.`value`), SUM(t.`value` >= 75), SUM(t.`value` < 75)
+FROM (SELECT e.`subject_id`, CASE WHEN g.`is_component_based` = 1 THEN g.`final_grade` ELSE g.`grade` END AS `value`
+      FROM `grades` g JOIN `enrollments` e ON g.`enrollment_id` = e.`id`) t
+WHERE t.`value` IS NOT NULL
+GROUP BY t.`subject_id`;
@@ -0,0 +1,3 @@
+ALTER TABLE `subjects`
+  DROP COLUMN IF EXISTS `seats_taken`,
+  DROP COLUMN IF EXISTS `capacity`;
@@ -0,0 +1,7 @@
+-- Seat limits for enrollment admission (models/subject.py reserve_seats); NULL means unlimited.
+ALTER TABLE `subjects`
+  ADD COLUMN IF NOT EXISTS `capacity` int(11) DEFAULT NULL,
+  ADD COLUMN IF NOT EXISTS `seats_taken` int(11) NOT NULL DEFAULT 0;
+
+UPDATE `subjects` SET `seats_taken` =
+  (SELECT COUNT(*) FROM `enrollments` e WHERE e.`subject_id` = `subjects`.`id` AND e.`status` <> 'denied');
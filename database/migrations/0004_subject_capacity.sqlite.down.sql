@@ -0,0 +1,2 @@
+ALTER TABLE `subjects` DROP COLUMN `seats_taken`;
+ALTER TABLE `subjects` DROP COLUMN `capacity`;
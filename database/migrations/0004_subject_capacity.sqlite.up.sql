@@ -0,0 +1,6 @@
+-- Seat limits for enrollment admission (models/subject.py reserve_seats); NULL means unlimited.
+ALTER TABLE `subjects` ADD COLUMN `capacity` int(11) DEFAULT NULL;
+ALTER TABLE `subjects` ADD COLUMN `seats_taken` int(11) NOT NULL DEFAULT 0;
+
+UPDATE `subjects` SET `seats_taken` =
+  (SELECT COUNT(*) FROM `enrollments` e WHERE e.`subject_id` = `subjects`.`id` AND e.`status` <> 'denied');
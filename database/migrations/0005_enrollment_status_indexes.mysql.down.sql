@@ -0,0 +1,4 @@
+ALTER TABLE `enrollments`
+  ADD KEY IF NOT EXISTS `subject_id` (`subject_id`),
+  DROP KEY IF EXISTS `subject_status`,
+  DROP KEY IF EXISTS `student_status`;
@@ -0,0 +1,7 @@
+-- Rosters, pending queues and transcripts filter enrollments on (subject_id, status) or
+-- (student_id, status). The composite index also serves the subject_id foreign key, so the
+-- single-column key is dropped.
+ALTER TABLE `enrollments`
+  ADD KEY IF NOT EXISTS `subject_status` (`subject_id`, `status`),
+  ADD KEY IF NOT EXISTS `student_status` (`student_id`, `status`),
+  DROP KEY IF EXISTS `subject_id`;
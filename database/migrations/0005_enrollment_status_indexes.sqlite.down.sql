@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS `enrollments_subject_id` ON `enrollments` (`subject_id`);
+DROP INDEX IF EXISTS `enrollments_subject_status`;
+DROP INDEX IF EXISTS `enrollments_student_status`;
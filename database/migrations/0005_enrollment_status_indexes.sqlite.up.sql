@@ -0,0 +1,5 @@
+-- Rosters, pending queues and transcripts filter enrollments on (subject_id, status) or
+-- (student_id, status); the composite index replaces the single-column subject_id one.
+CREATE INDEX IF NOT EXISTS `enrollments_subject_status` ON `enrollments` (`subject_id`, `status`);
+CREATE INDEX IF NOT EXISTS `enrollments_student_status` ON `enrollments` (`student_id`, `status`);
+DROP INDEX IF EXISTS `enrollments_subject_id`;
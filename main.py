@@ -1,41 +1,64 @@
+import argparse
 import os
 import sys
 from colorama import init, Fore, Style
-from database import db
-from utils import Auth, Display
-from portals import AdminPortal, TeacherPortal, StudentPortal
+from database import db, SQLiteBackend, configure_logging
+from utils import Display, files
+from portals import run_session
+from server import PortalServer
 
 def main():
+    parser = argparse.ArgumentParser(description="Mana University portal")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="use the embedded SQLite database at PATH (':memory:' for a throwaway one) instead of MySQL")
+    parser.add_argument('--serve', metavar='ADDRESS',
+                        help="host portal sessions for telnet/netcat clients on HOST:PORT, PORT or unix:PATH")
+    parser.add_argument('--max-sessions', type=int, default=32, help="concurrent sessions in server mode")
+    parser.add_argument('--pool-size', type=int, default=8, help="database connections shared by the sessions")
+    parser.add_argument('--log-file', metavar='PATH', default=os.environ.get('LMS_LOG_FILE'),
+                        help="append failed and slow queries to PATH (default: $LMS_LOG_FILE)")
+    parser.add_argument('--files-dir', default='lms_files',
+                        help="in server mode, the only directory imports and exports may use (default: lms_files)")
+    args = parser.parse_args()
+    # The local portal owns the terminal, so its log only goes to the file; the server also logs to stderr.
+    configure_logging(args.log_file, sys.stderr if args.serve else None)
+    if args.sqlite:
+        db.backend = SQLiteBackend(args.sqlite)
+
     init(autoreset=True)
     
-    if not db.connect():
+    if not db.connect(pool_size=args.pool_size if args.serve else None):
         print(f"{Fore.RED}Database connection failed!{Style.RESET_ALL}")
         sys.exit(1)
     
-    display = Display()
-    
+    if args.serve:
+        serve(args)
+        return
+
     try:
-        while True:
-            os.system('cls' if os.name == 'nt' else 'clear')
-            user = Auth.login()
-            
-            if user:
-                if user['role'] == 'admin':
-                    portal = AdminPortal(user)
-                elif user['role'] == 'teacher':
-                    portal = TeacherPortal(user)
-                elif user['role'] == 'student':
-                    portal = StudentPortal(user)
-                
-                portal.show_menu()
-            
-            if input(f"\n{Fore.YELLOW}Login again? (y/n): {Style.RESET_ALL}").lower() != 'y':
-                break
-                
+        run_session()
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}Goodbye!{Style.RESET_ALL}")
     finally:
         db.close()
 
+def serve(args):
+    # Session clients are terminals even though the server's own stdout may not be.
+    Display.use_color = 'NO_COLOR' not in os.environ
+    # Remote clients name files, not paths, so they cannot read or overwrite the server's own files.
+    files.sandbox = os.path.abspath(args.files_dir)
+    os.makedirs(files.sandbox, exist_ok=True)
+    server = PortalServer(PortalServer.parse_address(args.serve), max_sessions=args.max_sessions)
+    print(f"Serving portal sessions on {server.describe()} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    except OSError as error:
+        print(f"{Fore.RED}Cannot serve on {server.describe()}: {error}{Style.RESET_ALL}")
+        sys.exit(1)
+    finally:
+        db.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,233 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from database import db, SQLiteBackend, configure_logging
+from models.grade import Grade
+from models.subject import Subject
+from tools.seed import DataGenerator
+from tools.benchmark import Benchmark
+from database.migrate import Migrator
+from tools.advisor import IndexAdvisor
+from models.importer import UserImporter
+from models.exporter import GradeExporter
+from portals.loadtest import LoadTest
+
+def rebuild_stats(args):
+    if Subject.recount_seats() is None:
+        print("Failed to recount subject seats")
+        return 1
+    drifted = Grade.rebuild_statistics()
+    if drifted is None:
+        print("Failed to rebuild grade statistics")
+        return 1
+    if drifted:
+        print(f"Rebuilt grade_summary; corrected subject IDs: {', '.join(str(s) for s in drifted)}")
+    else:
+        print("Rebuilt grade_summary; it already matched the grades table")
+    return 0
+
+def seed(args):
+    generator = DataGenerator(seed=args.seed, courses=args.courses, teachers=args.teachers, subjects=args.subjects,
+                              students=args.students, enrollments=args.enrollments, batch_size=args.batch_size)
+    counts = generator.run()
+    print(", ".join(f"{key}: {value}" for key, value in counts.items()))
+    return 0
+
+def bench(args):
+    benchmark = Benchmark(repeat=args.repeat)
+    report = benchmark.run(progress=lambda r: print(
+        f"{r['name']:<40} median {r['median_ms']:>10.3f} ms  p95 {r['p95_ms']:>10.3f} ms  queries {r['queries_per_call']}"))
+    Benchmark.save(report, args.output)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        print(f"\nCompared with {args.compare}:")
+        print("\n".join(Benchmark.compare(report, args.compare)))
+    return 0
+
+def import_users(args):
+    importer = UserImporter(args.role, chunk_size=args.chunk_size)
+    try:
+        result = importer.run(args.file)
+    except (OSError, ValueError) as error:
+        print(f"Import failed: {error}")
+        return 1
+    print(f"Imported {result['imported']} {args.role}s, rejected {result['rejected']} in {result['seconds']} s")
+    for line, reason, row in importer.rejects[:20]:
+        print(f"  line {line}: {reason}")
+    if args.rejects and importer.rejects:
+        importer.write_rejects(args.rejects)
+        print(f"Rejected rows written to {args.rejects}")
+    return 0
+
+def export(args):
+    exporter = GradeExporter(args.format, batch_size=args.batch_size)
+    if args.kind != 'all' and args.id is None:
+        print(f"export {args.kind} needs --id")
+        return 1
+    output = args.output or (f"grades.{args.format}" if args.kind == 'all' else f"{args.kind}_{args.id}.{args.format}")
+    try:
+        if args.kind == 'subject':
+            count = exporter.subject_sheet(args.id, output)
+        elif args.kind == 'transcript':
+            count = exporter.transcript(args.id, output)
+        else:
+            count = exporter.full_dump(output)
+    except OSError as error:
+        print(f"Export failed: {error}")
+        return 1
+    if count is None:
+        print("Export failed")
+        return 1
+    print(f"{count} rows written to {output}")
+    return 0
+
+def loadtest(args):
+    if db.fetch_one("SELECT COUNT(*) FROM students")[0] < args.users:
+        print("Seeding the database for the load test...")
+        DataGenerator(seed=args.seed, courses=10, teachers=max(10, args.users // 20), subjects=max(50, args.users // 5),
+                      students=args.users * 2, enrollments=args.users * 10).run()
+    # Sessions share a connection pool, as they would under 'main.py --serve'.
+    db.close()
+    if not db.connect(pool_size=args.pool_size):
+        print("Database connection failed!")
+        return 1
+    mix = dict(zip(('student', 'teacher', 'admin'), (int(v) for v in args.mix.split(':'))))
+    report = LoadTest(users=args.users, mix=mix, seed=args.seed).run()
+
+    sessions = report['sessions']
+    print(f"{args.users} virtual users {report['users']} in {report['seconds']} s: "
+          f"{sessions['completed']} sessions completed, {sessions['failed']} failed")
+    print(f"Throughput: {report['actions_per_second']} actions/s, {report['sessions_per_second']} sessions/s, "
+          f"{report['queries']} queries ({report['query_errors']} failed)")
+    queue = report['admissions']
+    if queue['processed']:
+        print(f"Admission queue: {queue['processed']} requests in {queue['batches']} batches "
+              f"(largest {queue['largest_batch']}), wait p50 {queue['wait_p50_ms']:.1f} ms, "
+              f"p95 {queue['wait_p95_ms']:.1f} ms, max {queue['wait_max_ms']:.1f} ms")
+    print(f"\n{'action':<28} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'queries':>8}")
+    for a in report['actions']:
+        print(f"{a['action']:<28} {a['count']:>6} {a['p50_ms']:>9.2f} {a['p95_ms']:>9.2f} {a['p99_ms']:>9.2f} "
+              f"{a['max_ms']:>9.2f} {a['queries_per_action']:>8}")
+    if args.output:
+        Benchmark.save(report, args.output)
+        print(f"\nResults written to {args.output}")
+    return 0 if sessions['failed'] == 0 else 1
+
+def migrate(args):
+    migrator = Migrator()
+    if args.status:
+        for version, name, applied_at in migrator.status():
+            print(f"{version:04d}_{name:<40} {applied_at or 'pending'}")
+        return 0
+    try:
+        steps = migrator.migrate(args.to, progress=lambda direction, m: print(
+            f"{'Applying' if direction == 'up' else 'Reverting'} {m.version:04d}_{m.name}"))
+    except RuntimeError as error:
+        print(error)
+        return 1
+    print(f"Schema is at version {migrator.current()}" + ("" if steps else " (nothing to do)"))
+    return 0
+
+def advise(args):
+    try:
+        report = IndexAdvisor(min_rows=args.min_rows).run()
+    except RuntimeError as error:
+        print(error)
+        return 1
+    for result in report['results']:
+        if not result['findings'] and not args.verbose:
+            continue
+        print(f"{result['case']} ({result['origin']})\n  {result['statement'][:160]}")
+        for finding in result['findings'] or ["ok"]:
+            print(f"  - {finding}")
+    print(f"\n{report['flagged']} of {report['statements']} statements flagged on {report['backend']} "
+          f"(tables under {report['min_rows']} rows ignored)")
+    if args.output:
+        Benchmark.save(report, args.output)
+        print(f"Results written to {args.output}")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Maintenance commands for the LMS database")
+    parser.add_argument('--sqlite', metavar='PATH', help="use the embedded SQLite database at PATH instead of MySQL")
+    parser.add_argument('--log-file', metavar='PATH', default=os.environ.get('LMS_LOG_FILE'),
+                        help="also append failed and slow queries to PATH (default: $LMS_LOG_FILE)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = commands.add_parser('rebuild-stats', help="Reconcile grade_summary and subject seat counts with their source tables")
+    rebuild.set_defaults(func=rebuild_stats)
+
+    generate = commands.add_parser('seed', help="Fill the schema with seeded synthetic data")
+    generate.add_argument('--seed', type=int, default=42)
+    generate.add_argument('--courses', type=int, default=20)
+    generate.add_argument('--teachers', type=int, default=200)
+    generate.add_argument('--subjects', type=int, default=2000)
+    generate.add_argument('--students', type=int, default=100000)
+    generate.add_argument('--enrollments', type=int, default=1000000)
+    generate.add_argument('--batch-size', type=int, default=5000)
+    generate.set_defaults(func=seed)
+
+    benchmark = commands.add_parser('bench', help="Time the model methods and record the results as JSON")
+    benchmark.add_argument('--repeat', type=int, default=5)
+    benchmark.add_argument('--output', default='bench_results.json')
+    benchmark.add_argument('--compare', help="Previous results file to compare against")
+    benchmark.set_defaults(func=bench)
+    importer = commands.add_parser('import', help="Bulk-load students or teachers from a CSV file")
+    importer.add_argument('role', choices=sorted(UserImporter.COLUMNS))
+    importer.add_argument('file')
+    importer.add_argument('--chunk-size', type=int, default=1000)
+    importer.add_argument('--rejects', help="Write rejected rows with their reasons to this CSV file")
+    importer.set_defaults(func=import_users)
+    exporter = commands.add_parser('export', help="Stream grades to CSV or JSON Lines")
+    exporter.add_argument('kind', choices=['subject', 'transcript', 'all'])
+    exporter.add_argument('--id', type=int, help="subject ID or student ID (not user ID)")
+    exporter.add_argument('--format', choices=GradeExporter.FORMATS, default='csv')
+    exporter.add_argument('--output')
+    exporter.add_argument('--batch-size', type=int, default=1000)
+    exporter.set_defaults(func=export)
+    load = commands.add_parser('loadtest', help="Run concurrent scripted portal sessions and report latencies "
+                                                "(uses a seeded temporary SQLite file unless --sqlite is given)")
+    load.add_argument('--users', type=int, default=100)
+    load.add_argument('--mix', default='80:15:5', help="student:teacher:admin weights")
+    load.add_argument('--pool-size', type=int, default=8)
+    load.add_argument('--seed', type=int, default=42)
+    load.add_argument('--output', help="Also write the report as JSON")
+    load.set_defaults(func=loadtest, temporary_sqlite=True)
+    migration = commands.add_parser('migrate', help="Apply pending schema migrations (database/migrations)")
+    migration.add_argument('--to', type=int, metavar='VERSION', help="migrate up or down to this version (0 is the original dump)")
+    migration.add_argument('--status', action='store_true', help="list migrations and when they were applied")
+    migration.set_defaults(func=migrate)
+    advisor = commands.add_parser('advise', help="EXPLAIN the statements the models send and flag full scans and filesorts "
+                                                 "(run against seeded data)")
+    advisor.add_argument('--min-rows', type=int, default=1000, help="ignore tables smaller than this")
+    advisor.add_argument('--verbose', action='store_true', help="also list statements with no findings")
+    advisor.add_argument('--output', help="Also write the report, with full plans, as JSON")
+    advisor.set_defaults(func=advise)
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    configure_logging(args.log_file, sys.stderr)
+    workdir = None
+    sqlite = args.sqlite
+    if not sqlite and getattr(args, 'temporary_sqlite', False):
+        # A file rather than ':memory:': SQLite's shared cache fails concurrent access with
+        # "table is locked" instead of waiting for the lock.
+        workdir = tempfile.mkdtemp(prefix='lms_')
+        sqlite = os.path.join(workdir, 'lms.sqlite3')
+    if sqlite:
+        db.backend = SQLiteBackend(sqlite)
+    if not db.connect():
+        print("Database connection failed!")
+        sys.exit(1)
+    try:
+        sys.exit(args.func(args))
+    finally:
+        db.close()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -2,4 +2,5 @@ from .user import User
 from .course import Course
 from .subject import Subject
 from .enrollment import Enrollment
-from .grade import Grade
\ No newline at end of file
+from .grade import Grade
+from .cache import QueryCache
\ No newline at end of file
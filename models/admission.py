@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from collections import deque
+from database import Error, db
+from models.enrollment import Enrollment
+from models.subject import Subject
+
+class AdmissionRequest:
+    __slots__ = ('student_id', 'subject_id', 'submitted', 'thread', 'outcome', 'done')
+
+    def __init__(self, student_id, subject_id):
+        self.student_id = student_id
+        self.subject_id = subject_id
+        self.submitted = time.perf_counter()
+        # The submitting thread, so per-request costs can be charged back to it.
+        self.thread = threading.get_ident()
+        self.outcome = None
+        self.done = threading.Event()
+
+class AdmissionQueue:
+    """
+    Group-commit front end for enrollment requests during registration rushes. One worker thread
+    takes whatever has queued up while it wrote the previous batch (up to batch_size) and handles
+    it with one duplicate check, one conditional seat UPDATE per subject and one executemany
+    insert, all in a single transaction. When idle a request is handled on its own at once.
+    Outcomes are those of Enrollment.request.
+    """
+    def __init__(self, batch_size=500, wait_log_size=1000):
+        self.batch_size = batch_size
+        self.processed = 0
+        self.batches = 0
+        self.largest_batch = 0
+        # Callables run as listener(batch) on the worker once a batch is settled, before its
+        # submitters wake up (see portals/loadtest.py).
+        self.listeners = []
+        self._waits = deque(maxlen=wait_log_size)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def enroll(self, student_id, subject_id, timeout=30):
+        """Queue a request and wait for its outcome; None if it failed or timed out"""
+        request = self.submit(student_id, subject_id)
+        request.done.wait(timeout)
+        return request.outcome
+
+    def submit(self, student_id, subject_id):
+        request = AdmissionRequest(int(student_id), int(subject_id))
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='admissions', daemon=True)
+                self._worker.start()
+        self._queue.put(request)
+        return request
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._process(batch)
+            except Error:
+                # Something in the batch tripped a constraint (e.g. a concurrent insert from another
+                # process); the transaction rolled back, so settle each request on its own.
+                for request in batch:
+                    request.outcome = Enrollment.request(request.student_id, request.subject_id)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.processed += len(batch)
+                    self.batches += 1
+                    self.largest_batch = max(self.largest_batch, len(batch))
+                    self._waits.extend((finished - request.submitted) * 1000 for request in batch)
+                for listener in self.listeners:
+                    listener(batch)
+                for request in batch:
+                    request.done.set()
+
+    def _process(self, batch):
+        by_subject = {}
+        seen = set()
+        for request in batch:
+            pair = (request.student_id, request.subject_id)
+            if pair in seen:
+                request.outcome = 'duplicate'
+                continue
+            seen.add(pair)
+            by_subject.setdefault(request.subject_id, []).append(request)
+
+        existing = Enrollment.existing_pairs(list(seen))
+        rows = []
+        with db.transaction():
+            for subject_id, requests in by_subject.items():
+                fresh = []
+                for request in requests:
+                    if (request.student_id, subject_id) in existing:
+                        request.outcome = 'duplicate'
+                    else:
+                        fresh.append(request)
+                if not fresh:
+                    continue
+                seats = Subject.reserve_seats(subject_id, len(fresh))
+                for position, request in enumerate(fresh):
+                    if seats is None:
+                        request.outcome = 'not_found'
+                    elif position < seats:
+                        rows.append((request.student_id, subject_id))
+                    else:
+                        request.outcome = 'full'
+            if rows:
+                db.execute_many(Enrollment.INSERT_QUERY, rows)
+        for request in batch:
+            if request.outcome is None:
+                request.outcome = 'pending'
+
+    def stats(self):
+        """Current queue depth, batch counts and recent wait times (submit to outcome)"""
+        with self._lock:
+            waits = sorted(self._waits)
+            batches = self.batches
+            processed = self.processed
+            largest = self.largest_batch
+
+        def percentile(p):
+            return waits[min(len(waits) - 1, int(len(waits) * p / 100))] if waits else 0.0
+
+        return {
+            'depth': self._queue.qsize(),
+            'processed': processed,
+            'batches': batches,
+            'mean_batch': processed / batches if batches else 0.0,
+            'largest_batch': largest,
+            'wait_p50_ms': percentile(50),
+            'wait_p95_ms': percentile(95),
+            'wait_max_ms': waits[-1] if waits else 0.0
+        }
+
+admissions = AdmissionQueue()
\ No newline at end of file
@@ -0,0 +1,175 @@
+import logging
+import math
+from collections import Counter
+from database import db
+from models.grade import Grade
+
+logger = logging.getLogger('lms.analytics')
+
+class GradeSketch:
+    """
+    Mergeable summary of scores on the 0-100 scale. Scores are bucketed at the 0.01 resolution
+    the schema stores them with, so histograms and percentiles stay exact after any number of
+    merges; mean and variance use Welford/Chan moments.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.buckets = Counter()
+
+    def add(self, value):
+        if value is None:
+            return
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.buckets[round(value * 100)] += 1
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.buckets.update(other.buckets)
+        return self
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / self.count) if self.count else None
+
+    @property
+    def minimum(self):
+        return min(self.buckets) / 100 if self.buckets else None
+
+    @property
+    def maximum(self):
+        return max(self.buckets) / 100 if self.buckets else None
+
+    def percentile(self, p):
+        """Nearest-rank percentile, p in 0-100"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return bucket / 100
+        return self.maximum
+
+    def histogram(self, bin_width=10):
+        """List of (low, high, count) bins covering 0-100; the last bin includes 100"""
+        bins = [0] * math.ceil(100 / bin_width)
+        for bucket, count in self.buckets.items():
+            index = min(int(bucket / 100 // bin_width), len(bins) - 1)
+            bins[max(index, 0)] += count
+        return [(i * bin_width, min((i + 1) * bin_width, 100), count) for i, count in enumerate(bins)]
+
+class GradeDistribution:
+    """Final-grade and component sketches for one subject, or for any merged group of subjects"""
+    def __init__(self, subject_id=None, code=None, name=None, teacher_id=None, course_id=None):
+        self.subject_id = subject_id
+        self.code = code
+        self.name = name
+        self.teacher_id = teacher_id
+        self.course_id = course_id
+        self.final = GradeSketch()
+        self.activity = GradeSketch()
+        self.quiz = GradeSketch()
+        self.exam = GradeSketch()
+
+    @property
+    def passed(self):
+        return sum(count for bucket, count in self.final.buckets.items() if bucket >= 7500)
+
+    @property
+    def failed(self):
+        return self.final.count - self.passed
+
+    def merge(self, other):
+        self.final.merge(other.final)
+        self.activity.merge(other.activity)
+        self.quiz.merge(other.quiz)
+        self.exam.merge(other.exam)
+        return self
+
+class GradeAnalytics:
+    @staticmethod
+    def build(teacher_id=None, subject_id=None):
+        """
+        One streaming pass over grades joined to enrollments and subjects, checked against the
+        grade_summary totals from Grade.get_grade_statistics for the same scope.
+        Returns {subject_id: GradeDistribution}; combine() merges them without rescanning.
+        """
+        query = """SELECT s.id, s.code, s.name, s.teacher_id, s.course_id, g.is_component_based,
+                   g.grade, g.final_grade, g.activity_score, g.quiz_score, g.exam_score
+                   FROM grades g
+                   JOIN enrollments e ON g.enrollment_id = e.id
+                   JOIN subjects s ON e.subject_id = s.id"""
+        conditions = []
+        params = []
+        if teacher_id is not None:
+            conditions.append("s.teacher_id = %s")
+            params.append(teacher_id)
+        if subject_id is not None:
+            conditions.append("s.id = %s")
+            params.append(subject_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        distributions = {}
+        for row in db.iter_query(query, tuple(params)):
+            distribution = distributions.get(row[0])
+            if distribution is None:
+                distribution = distributions[row[0]] = GradeDistribution(*row[:5])
+            if row[5]:  # is_component_based
+                distribution.final.add(row[7])
+                distribution.activity.add(row[8])
+                distribution.quiz.add(row[9])
+                distribution.exam.add(row[10])
+            else:
+                distribution.final.add(row[6])
+        GradeAnalytics.reconcile(distributions, teacher_id, subject_id)
+        return distributions
+
+    @staticmethod
+    def reconcile(distributions, teacher_id=None, subject_id=None):
+        """
+        Compare the graded, passed and failed counts with Grade.get_grade_statistics; a mismatch
+        means grade_summary has drifted and is logged. Returns True when they agree.
+        """
+        stats = Grade.get_grade_statistics(teacher_id=teacher_id, subject_id=subject_id)
+        if stats is None:
+            return False
+        combined = GradeAnalytics.combine(distributions.values())
+        counted = (combined.final.count, combined.passed, combined.failed)
+        summary = (int(stats[0]), int(stats[2] or 0), int(stats[3] or 0))
+        if counted != summary:
+            logger.warning("grade_summary has drifted (graded/passed/failed %s, grades table %s); "
+                           "run 'manage.py rebuild-stats'", summary, counted)
+            return False
+        return True
+
+    @staticmethod
+    def combine(distributions, **labels):
+        """Merge several subject distributions, e.g. all of one teacher's or one course's subjects"""
+        combined = GradeDistribution(**labels)
+        for distribution in distributions:
+            combined.merge(distribution)
+        return combined
+
+    @staticmethod
+    def by_teacher(distributions, teacher_id):
+        return GradeAnalytics.combine((d for d in distributions.values() if d.teacher_id == teacher_id),
+                                      teacher_id=teacher_id)
+
+    @staticmethod
+    def by_course(distributions, course_id):
+        return GradeAnalytics.combine((d for d in distributions.values() if d.course_id == course_id),
+                                      course_id=course_id)
\ No newline at end of file
@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import OrderedDict
+from database import db
+
+class QueryCache:
+    """Thread-safe LRU cache with a time-to-live, for reference data that rarely changes"""
+    def __init__(self, name, maxsize=128, ttl=300):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+        value = loader()
+        with self._lock:
+            # Empty results are not cached because the database layer also returns [] on errors,
+            # a load that raced with an invalidation may already be stale, and rows read inside
+            # an open transaction may still be rolled back.
+            if value and generation == self._generation and not db.in_transaction():
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'invalidations': self.invalidations
+            }
+
+course_cache = QueryCache('courses')
+subject_cache = QueryCache('subjects')
+caches = [course_cache, subject_cache]
@@ -1,24 +1,49 @@
 from database import db
+from models.cache import course_cache, subject_cache
 
 class Course:
+    LIST_QUERY = "SELECT id, name, description FROM courses"
+
     @staticmethod
     def create(name, description):
         query = "INSERT INTO courses (name, description) VALUES (%s, %s)"
-        return db.execute_query(query, (name, description))
+        result = db.execute_query(query, (name, description))
+        Course.invalidate_cache()
+        return result
 
     @staticmethod
     def get_all():
-        return db.fetch_all("SELECT id, name, description FROM courses")
+        return course_cache.get_or_load(('all',), lambda: db.fetch_all(Course.LIST_QUERY))
+
+    @staticmethod
+    def get_page(after=None, before=None, limit=20):
+        return course_cache.get_or_load(('page', after, before, limit),
+                                        lambda: db.fetch_page(Course.LIST_QUERY, "id", after, before, limit))
+
+    @staticmethod
+    def iter_all(batch_size=500):
+        return db.iter_query(Course.LIST_QUERY, batch_size=batch_size)
 
     @staticmethod
     def get_by_id(course_id):
-        return db.fetch_one("SELECT id, name, description FROM courses WHERE id = %s", (course_id,))
+        return course_cache.get_or_load(('id', course_id),
+                                        lambda: db.fetch_one("SELECT id, name, description FROM courses WHERE id = %s", (course_id,)))
 
     @staticmethod
     def update(course_id, name, description):
         query = "UPDATE courses SET name = %s, description = %s WHERE id = %s"
-        return db.execute_query(query, (name, description, course_id))
+        result = db.execute_query(query, (name, description, course_id))
+        Course.invalidate_cache()
+        return result
 
     @staticmethod
     def delete(course_id):
-        return db.execute_query("DELETE FROM courses WHERE id = %s", (course_id,))
\ No newline at end of file
+        result = db.execute_query("DELETE FROM courses WHERE id = %s", (course_id,))
+        Course.invalidate_cache()
+        return result
+
+    @staticmethod
+    def invalidate_cache():
+        # Subject listings show the course name, so they go stale together.
+        course_cache.invalidate()
+        subject_cache.invalidate()
\ No newline at end of file
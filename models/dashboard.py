@@ -0,0 +1,64 @@
+import time
+from database import db
+
+class StudentDashboard:
+    """
+    Everything the student portal shows (profile, enrollments and grade components), loaded
+    with one joined query and kept for the session. Call invalidate() after the student's
+    enrollments change; the data is also reloaded once it is older than max_age seconds, so
+    approvals and grades posted by teachers still show up in a long session.
+    """
+    QUERY = """SELECT st.id, st.name, c.name, st.year_level,
+               e.id, s.code, s.name, e.status,
+               g.id, g.grade, g.remarks, g.activity_score, g.quiz_score, g.exam_score,
+               g.activity_weight, g.quiz_weight, g.exam_weight, g.final_grade, g.is_component_based
+               FROM students st
+               LEFT JOIN courses c ON st.course_id = c.id
+               LEFT JOIN enrollments e ON e.student_id = st.id
+               LEFT JOIN subjects s ON e.subject_id = s.id
+               LEFT JOIN grades g ON g.enrollment_id = e.id
+               WHERE st.user_id = %s
+               ORDER BY e.id"""
+
+    def __init__(self, user_id, max_age=300):
+        self.user_id = user_id
+        self.max_age = max_age
+        self.student_id = None
+        self.name = None
+        self.course = None
+        self.year_level = None
+        self._enrollments = []
+        self._grades = []
+        self._loaded_at = None
+
+    def load(self):
+        """Run the query; returns False if the student was not found (or the query failed)"""
+        rows = db.fetch_all(StudentDashboard.QUERY, (self.user_id,))
+        if not rows:
+            return False
+        self.student_id, self.name, self.course, self.year_level = rows[0][:4]
+        # Same row shapes as Enrollment.get_by_student and Grade.get_by_student.
+        self._enrollments = [(r[4], r[5], r[6], r[7]) for r in rows if r[4] is not None]
+        self._grades = [(r[5], r[6], r[9], r[10]) + tuple(r[11:19]) for r in rows
+                        if r[8] is not None and r[7] == 'approved']
+        self._loaded_at = time.monotonic()
+        return True
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def _current(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age:
+            self.load()
+
+    @property
+    def enrollments(self):
+        """(enrollment_id, code, name, status) rows"""
+        self._current()
+        return self._enrollments
+
+    @property
+    def grades(self):
+        """Grade rows of approved enrollments, as returned by Grade.get_by_student"""
+        self._current()
+        return self._grades
\ No newline at end of file
@@ -1,33 +1,166 @@
-from database import db
+from database import Error, db
+from models.grade import Grade
+from models.subject import Subject
 
 class Enrollment:
+    PENDING_BY_TEACHER_QUERY = """SELECT e.id, st.name, s.code, s.name, e.enrolled_at 
+                   FROM enrollments e 
+                   JOIN students st ON e.student_id = st.id 
+                   JOIN subjects s ON e.subject_id = s.id 
+                   WHERE s.teacher_id = %s AND e.status = 'pending'"""
+    APPROVED_BY_TEACHER_QUERY = """SELECT e.id, st.name, s.code, s.name 
+                   FROM enrollments e 
+                   JOIN students st ON e.student_id = st.id 
+                   JOIN subjects s ON e.subject_id = s.id 
+                   WHERE s.teacher_id = %s AND e.status = 'approved'"""
+
+    INSERT_QUERY = "INSERT INTO enrollments (student_id, subject_id) VALUES (%s, %s)"
+
     @staticmethod
     def create(student_id, subject_id):
-        query = "INSERT INTO enrollments (student_id, subject_id) VALUES (%s, %s)"
-        return db.execute_query(query, (student_id, subject_id))
+        """Insert without taking a seat; enrollment requests should go through request() or the admission queue"""
+        return db.execute_query(Enrollment.INSERT_QUERY, (student_id, subject_id))
+
+    @staticmethod
+    def request(student_id, subject_id):
+        """
+        Reserve a seat and file a pending enrollment in one transaction. Returns 'pending',
+        'full', 'duplicate', 'not_found', or None if the database failed.
+        """
+        try:
+            with db.transaction():
+                seats = Subject.reserve_seats(subject_id, 1)
+                if not seats:
+                    return 'full' if seats == 0 else 'not_found'
+                db.execute_query(Enrollment.INSERT_QUERY, (student_id, subject_id))
+            return 'pending'
+        except Error:
+            if Enrollment.existing_pairs([(student_id, subject_id)]):
+                return 'duplicate'
+            return None
+
+    @staticmethod
+    def existing_pairs(pairs):
+        """The (student_id, subject_id) pairs from pairs that already have an enrollment, in one query"""
+        if not pairs:
+            return set()
+        students = sorted({pair[0] for pair in pairs})
+        subjects = sorted({pair[1] for pair in pairs})
+        query = f"""SELECT student_id, subject_id FROM enrollments
+                    WHERE student_id IN ({', '.join(['%s'] * len(students))})
+                    AND subject_id IN ({', '.join(['%s'] * len(subjects))})"""
+        wanted = set(pairs)
+        return {pair for pair in db.fetch_all(query, tuple(students + subjects)) if tuple(pair) in wanted}
 
     @staticmethod
     def get_pending_by_teacher(teacher_id):
-        query = """SELECT e.id, st.name, s.code, s.name, e.enrolled_at 
-                   FROM enrollments e 
-                   JOIN students st ON e.student_id = st.id 
-                   JOIN subjects s ON e.subject_id = s.id 
-                   WHERE s.teacher_id = %s AND e.status = 'pending'"""
-        return db.fetch_all(query, (teacher_id,))
+        return db.fetch_all(Enrollment.PENDING_BY_TEACHER_QUERY, (teacher_id,))
+
+    @staticmethod
+    def iter_pending_by_teacher(teacher_id, batch_size=500):
+        return db.iter_query(Enrollment.PENDING_BY_TEACHER_QUERY, (teacher_id,), batch_size)
 
     @staticmethod
     def update_status(enrollment_id, status):
-        query = "UPDATE enrollments SET status = %s WHERE id = %s"
-        return db.execute_query(query, (status, enrollment_id))
+        """
+        Change one enrollment's status; denying frees its seat and re-approving takes one back through
+        the same capacity check as request(). Returns the number of rows changed, 'full', or None on failure.
+        """
+        try:
+            with db.transaction():
+                row = db.fetch_one("SELECT subject_id, status FROM enrollments WHERE id = %s", (enrollment_id,))
+                if row is None:
+                    return 0
+                subject_id, current = row
+                takes_seat = current == 'denied' and status != 'denied'
+                if takes_seat and not Subject.reserve_seats(subject_id, 1):
+                    return 'full'
+                # Conditional on the status read above, so a concurrent change cannot count a seat twice.
+                result = db.execute_query("UPDATE enrollments SET status = %s WHERE id = %s AND status = %s",
+                                          (status, enrollment_id, current))
+                if (takes_seat and not result) or (current != 'denied' and status == 'denied'):
+                    Subject.recount_seats(subject_id=subject_id)
+            return result
+        except Error:
+            return None
+
+    @staticmethod
+    def update_status_bulk(teacher_id, status, enrollment_ids=None, subject_id=None, course_id=None, enrolled_before=None):
+        """
+        Set the status of a teacher's pending enrollments with one set-based UPDATE.
+        Filters combine with AND; with none given every pending enrollment of the teacher is updated.
+        Returns the number of enrollments changed, or None on failure.
+        """
+        conditions = ["status = 'pending'", "subject_id IN (SELECT id FROM subjects WHERE teacher_id = %s)"]
+        params = [status, teacher_id]
+        if enrollment_ids is not None:
+            if not enrollment_ids:
+                return 0
+            conditions.append(f"id IN ({', '.join(['%s'] * len(enrollment_ids))})")
+            params.extend(enrollment_ids)
+        if subject_id is not None:
+            conditions.append("subject_id = %s")
+            params.append(subject_id)
+        if course_id is not None:
+            conditions.append("student_id IN (SELECT id FROM students WHERE course_id = %s)")
+            params.append(course_id)
+        if enrolled_before is not None:
+            conditions.append("enrolled_at < %s")
+            params.append(enrolled_before)
+        query = f"UPDATE enrollments SET status = %s WHERE {' AND '.join(conditions)}"
+        try:
+            with db.transaction():
+                result = db.execute_query(query, tuple(params))
+                if status == 'denied' and result:
+                    # Denied enrollments give their seats back.
+                    Subject.recount_seats(subject_id=subject_id, teacher_id=teacher_id)
+            return result
+        except Error:
+            return None
 
     @staticmethod
     def get_approved_by_teacher(teacher_id):
-        query = """SELECT e.id, st.name, s.code, s.name 
+        return db.fetch_all(Enrollment.APPROVED_BY_TEACHER_QUERY, (teacher_id,))
+
+    @staticmethod
+    def iter_approved_by_teacher(teacher_id, batch_size=500):
+        return db.iter_query(Enrollment.APPROVED_BY_TEACHER_QUERY, (teacher_id,), batch_size)
+
+    @staticmethod
+    def get_roster_by_teacher(teacher_id):
+        """Approved enrollments with their grade details in a single LEFT JOIN"""
+        query = """SELECT e.id, st.name, s.code, s.name, g.id,
+                   g.grade, g.remarks, g.activity_score, g.quiz_score, g.exam_score,
+                   g.activity_weight, g.quiz_weight, g.exam_weight, g.final_grade, g.is_component_based
                    FROM enrollments e 
                    JOIN students st ON e.student_id = st.id 
                    JOIN subjects s ON e.subject_id = s.id 
-                   WHERE s.teacher_id = %s AND e.status = 'approved'"""
-        return db.fetch_all(query, (teacher_id,))
+                   LEFT JOIN grades g ON g.enrollment_id = e.id
+                   WHERE s.teacher_id = %s AND e.status = 'approved'
+                   ORDER BY e.id"""
+        roster = []
+        for row in db.fetch_all(query, (teacher_id,)):
+            grade_data = Grade.detail_from_row(row[5:]) if row[4] is not None else None
+            roster.append((row[0], row[1], row[2], row[3], grade_data))
+        return roster
+
+    @staticmethod
+    def get_grade_sheet(teacher_id, subject_id):
+        """
+        Approved enrollments of one of the teacher's subjects with the student's user ID and the
+        current grade columns, for matching an imported grade sheet in a single query
+        """
+        query = """SELECT e.id, st.user_id, st.name,
+                   g.activity_score, g.quiz_score, g.exam_score,
+                   g.activity_weight, g.quiz_weight, g.exam_weight,
+                   CASE WHEN g.is_component_based = 1 THEN g.final_grade ELSE g.grade END, g.remarks, g.is_component_based
+                   FROM enrollments e
+                   JOIN students st ON e.student_id = st.id
+                   JOIN subjects s ON e.subject_id = s.id
+                   LEFT JOIN grades g ON g.enrollment_id = e.id
+                   WHERE s.id = %s AND s.teacher_id = %s AND e.status = 'approved'
+                   ORDER BY e.id"""
+        return db.fetch_all(query, (subject_id, teacher_id))
 
     @staticmethod
     def get_by_student(student_id):
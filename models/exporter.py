@@ -0,0 +1,103 @@
+import csv
+import datetime
+import decimal
+import json
+import os
+from database import Error, db
+
+class GradeExporter:
+    """
+    Stream grade data to CSV or JSON Lines. Rows come from db.iter_query, so only one fetch batch
+    is held in memory, and are written to PATH.part as they arrive; the file is renamed into place
+    once complete, so a failed export never leaves a truncated file behind.
+    """
+    FORMATS = ('csv', 'jsonl')
+
+    GRADE_COLUMNS = """CASE WHEN g.is_component_based = 1 THEN g.final_grade ELSE g.grade END, g.remarks"""
+
+    SUBJECT_SHEET = ('enrollment_id', 'user_id', 'student', 'activity', 'quiz', 'exam',
+                     'activity_weight', 'quiz_weight', 'exam_weight', 'final_grade', 'remarks')
+    TRANSCRIPT = ('subject_code', 'subject', 'teacher', 'activity', 'quiz', 'exam',
+                  'activity_weight', 'quiz_weight', 'exam_weight', 'final_grade', 'remarks')
+    FULL_DUMP = ('grade_id', 'enrollment_id', 'user_id', 'student', 'course', 'year_level', 'subject_code',
+                 'subject', 'teacher', 'activity', 'quiz', 'exam', 'final_grade', 'remarks', 'graded_at')
+
+    def __init__(self, fmt='csv', batch_size=1000):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.fmt = fmt
+        self.batch_size = batch_size
+
+    def subject_sheet(self, subject_id, path, teacher_id=None):
+        """Approved enrollments of a subject; the CSV form can be edited and re-imported with GradeSheetImporter"""
+        query = f"""SELECT e.id, st.user_id, st.name, g.activity_score, g.quiz_score, g.exam_score,
+                   g.activity_weight, g.quiz_weight, g.exam_weight, {self.GRADE_COLUMNS}
+                   FROM enrollments e
+                   JOIN students st ON e.student_id = st.id
+                   JOIN subjects s ON e.subject_id = s.id
+                   LEFT JOIN grades g ON g.enrollment_id = e.id
+                   WHERE s.id = %s AND e.status = 'approved'"""
+        params = (subject_id,)
+        if teacher_id is not None:
+            query += " AND s.teacher_id = %s"
+            params += (teacher_id,)
+        return self._export(path, self.SUBJECT_SHEET, query + " ORDER BY e.id", params)
+
+    def transcript(self, student_id, path):
+        """Every approved subject of one student with its grade"""
+        query = f"""SELECT s.code, s.name, t.name, g.activity_score, g.quiz_score, g.exam_score,
+                   g.activity_weight, g.quiz_weight, g.exam_weight, {self.GRADE_COLUMNS}
+                   FROM enrollments e
+                   JOIN subjects s ON e.subject_id = s.id
+                   LEFT JOIN teachers t ON s.teacher_id = t.id
+                   LEFT JOIN grades g ON g.enrollment_id = e.id
+                   WHERE e.student_id = %s AND e.status = 'approved'
+                   ORDER BY s.code"""
+        return self._export(path, self.TRANSCRIPT, query, (student_id,))
+
+    def full_dump(self, path):
+        """Every grade in the institution, in grade ID order"""
+        query = f"""SELECT g.id, e.id, st.user_id, st.name, c.name, st.year_level, s.code, s.name, t.name,
+                   g.activity_score, g.quiz_score, g.exam_score, {self.GRADE_COLUMNS}, g.created_at
+                   FROM grades g
+                   JOIN enrollments e ON g.enrollment_id = e.id
+                   JOIN students st ON e.student_id = st.id
+                   JOIN subjects s ON e.subject_id = s.id
+                   LEFT JOIN courses c ON st.course_id = c.id
+                   LEFT JOIN teachers t ON s.teacher_id = t.id
+                   ORDER BY g.id"""
+        return self._export(path, self.FULL_DUMP, query)
+
+    def _export(self, path, columns, query, params=None):
+        """Write the rows and return how many were exported, or None if the query failed"""
+        partial = path + '.part'
+        count = 0
+        try:
+            # A transaction reads from one snapshot and raises driver errors instead of
+            # ending the stream early as if it were complete.
+            with db.transaction(), open(partial, 'w', newline='', encoding='utf-8') as target:
+                if self.fmt == 'csv':
+                    writer = csv.writer(target)
+                    writer.writerow(columns)
+                    for row in db.iter_query(query, params, self.batch_size):
+                        writer.writerow(row)
+                        count += 1
+                else:
+                    for row in db.iter_query(query, params, self.batch_size):
+                        target.write(json.dumps(dict(zip(columns, row)), default=self._json_value) + '\n')
+                        count += 1
+            os.replace(partial, path)
+            return count
+        except Error:
+            return None
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    @staticmethod
+    def _json_value(value):
+        if isinstance(value, decimal.Decimal):
+            return float(value)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        return str(value)
\ No newline at end of file
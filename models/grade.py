@@ -1,64 +1,120 @@
-from database import db
+from database import Error, db
+from models.grading import GradeEngine
 
 class Grade:
+    COMPONENT_UPSERT = """INSERT INTO grades (enrollment_id, activity_score, quiz_score, exam_score,
+                          activity_weight, quiz_weight, exam_weight, final_grade, remarks, is_component_based) 
+                          VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                          ON DUPLICATE KEY UPDATE
+                          activity_score = VALUES(activity_score), quiz_score = VALUES(quiz_score),
+                          exam_score = VALUES(exam_score), activity_weight = VALUES(activity_weight),
+                          quiz_weight = VALUES(quiz_weight), exam_weight = VALUES(exam_weight),
+                          final_grade = VALUES(final_grade), remarks = VALUES(remarks),
+                          is_component_based = VALUES(is_component_based)"""
+    BY_STUDENT_QUERY = """SELECT s.code, s.name, g.grade, g.remarks, g.activity_score, g.quiz_score, 
+                   g.exam_score, g.activity_weight, g.quiz_weight, g.exam_weight, 
+                   g.final_grade, g.is_component_based
+                   FROM grades g 
+                   JOIN enrollments e ON g.enrollment_id = e.id 
+                   JOIN subjects s ON e.subject_id = s.id 
+                   WHERE e.student_id = %s AND e.status = 'approved'"""
+
     @staticmethod
     def create_or_update(enrollment_id, grade=None, remarks=None, activity_score=None, quiz_score=None, exam_score=None, activity_weight=40.0, quiz_weight=20.0, exam_weight=40.0, is_component_based=False):
         """
         Create or update a grade entry. Supports both legacy single-grade and new component-based grading.
+        Relies on the unique key on grades.enrollment_id, so either path is a single atomic upsert.
         """
-        existing = db.fetch_one("SELECT id FROM grades WHERE enrollment_id = %s", (enrollment_id,))
-        
-        # Calculate final grade and remarks for component-based grading
+        if is_component_based:
+            row = Grade.component_row(enrollment_id, activity_score, quiz_score, exam_score,
+                                      activity_weight, quiz_weight, exam_weight, remarks)
+            return db.execute_query(Grade.COMPONENT_UPSERT, row)
+        else:
+            query = """INSERT INTO grades (enrollment_id, grade, remarks) VALUES (%s, %s, %s)
+                       ON DUPLICATE KEY UPDATE grade = VALUES(grade), remarks = VALUES(remarks)"""
+            return db.execute_query(query, (enrollment_id, grade, remarks))
+
+    @staticmethod
+    def bulk_upsert(rows):
+        """
+        Write component scores for many enrollments in one executemany batch and one commit.
+        Each row is (enrollment_id, activity_score, quiz_score, exam_score) optionally followed by
+        (activity_weight, quiz_weight, exam_weight). Returns the affected row count or None on failure;
+        raises ValueError if a row's weights are negative or sum to 0.
+        """
+        rows = [tuple(row) + (40.0, 20.0, 40.0)[len(row) - 4:] for row in rows]
+        if not rows:
+            return 0
+        columns = list(zip(*rows))
+        GradeEngine.check_weights(*columns[4:7])
+        params = GradeEngine.upsert_rows(*columns)
+        return db.execute_many(Grade.COMPONENT_UPSERT, params)
+
+    @staticmethod
+    def regrade(subject_id=None, activity_weight=None, quiz_weight=None, exam_weight=None):
+        """
+        Recompute final grades and remarks for every component-based grade, optionally limited to
+        one subject. Passing all three weights applies a new weighting policy; otherwise each row's
+        stored weights are reused. Returns the affected row count or None on failure;
+        raises ValueError if the weights are negative or sum to 0.
+        """
+        query = """SELECT g.enrollment_id, g.activity_score, g.quiz_score, g.exam_score,
+                   g.activity_weight, g.quiz_weight, g.exam_weight, g.remarks
+                   FROM grades g JOIN enrollments e ON g.enrollment_id = e.id
+                   WHERE g.is_component_based = 1"""
+        params = ()
+        if subject_id is not None:
+            query += " AND e.subject_id = %s"
+            params = (subject_id,)
+        rows = db.fetch_all(query, params)
+        if not rows:
+            return 0
+        enrollment_ids, activity, quiz, exam, stored_aw, stored_qw, stored_ew, remarks = zip(*rows)
+        if activity_weight is None or quiz_weight is None or exam_weight is None:
+            activity_weight, quiz_weight, exam_weight = stored_aw, stored_qw, stored_ew
+        GradeEngine.check_weights(activity_weight, quiz_weight, exam_weight)
+        params = GradeEngine.upsert_rows(enrollment_ids, activity, quiz, exam,
+                                         activity_weight, quiz_weight, exam_weight, remarks)
+        return db.execute_many(Grade.COMPONENT_UPSERT, params)
+
+    @staticmethod
+    def component_row(enrollment_id, activity_score, quiz_score, exam_score, activity_weight=40.0, quiz_weight=20.0, exam_weight=40.0, remarks=None):
+        """Build the parameter tuple for COMPONENT_UPSERT, computing final grade and remarks"""
         final_grade = None
         computed_remarks = remarks
+        activity_score, quiz_score, exam_score = (None if s is None else round(s, 2)
+                                                  for s in (activity_score, quiz_score, exam_score))
         
-        if is_component_based and activity_score is not None and quiz_score is not None and exam_score is not None:
-            # Ensure weights sum to 100
-            total_weight = activity_weight + quiz_weight + exam_weight
-            if total_weight != 100:
-                activity_weight = activity_weight * (100 / total_weight)
-                quiz_weight = quiz_weight * (100 / total_weight)
-                exam_weight = exam_weight * (100 / total_weight)
-            
+        if activity_score is not None and quiz_score is not None and exam_score is not None:
+            activity_weight, quiz_weight, exam_weight = Grade.normalize_weights(activity_weight, quiz_weight, exam_weight)
             final_grade = (activity_score * activity_weight / 100) + (quiz_score * quiz_weight / 100) + (exam_score * exam_weight / 100)
+            # Rounded to the decimal(5,2) columns, like the scores, so both backends store the same values.
+            final_grade = round(final_grade, 2)
+            activity_weight, quiz_weight, exam_weight = (round(w, 2) for w in (activity_weight, quiz_weight, exam_weight))
             computed_remarks = "Passed" if final_grade >= 75 else "Failed"
         
-        if existing:
-            if is_component_based:
-                query = """UPDATE grades SET 
-                          activity_score = %s, quiz_score = %s, exam_score = %s,
-                          activity_weight = %s, quiz_weight = %s, exam_weight = %s,
-                          final_grade = %s, remarks = %s, is_component_based = %s 
-                          WHERE enrollment_id = %s"""
-                return db.execute_query(query, (activity_score, quiz_score, exam_score, 
-                                              activity_weight, quiz_weight, exam_weight,
-                                              final_grade, computed_remarks, is_component_based, enrollment_id))
-            else:
-                query = "UPDATE grades SET grade = %s, remarks = %s WHERE enrollment_id = %s"
-                return db.execute_query(query, (grade, remarks, enrollment_id))
-        else:
-            if is_component_based:
-                query = """INSERT INTO grades (enrollment_id, activity_score, quiz_score, exam_score,
-                          activity_weight, quiz_weight, exam_weight, final_grade, remarks, is_component_based) 
-                          VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-                return db.execute_query(query, (enrollment_id, activity_score, quiz_score, exam_score,
-                                              activity_weight, quiz_weight, exam_weight, 
-                                              final_grade, computed_remarks, is_component_based))
-            else:
-                query = "INSERT INTO grades (enrollment_id, grade, remarks) VALUES (%s, %s, %s)"
-                return db.execute_query(query, (enrollment_id, grade, remarks))
+        return (enrollment_id, activity_score, quiz_score, exam_score,
+                activity_weight, quiz_weight, exam_weight, final_grade, computed_remarks, True)
+
+    @staticmethod
+    def normalize_weights(activity_weight, quiz_weight, exam_weight):
+        """Scale the three weights so they sum to 100"""
+        total_weight = activity_weight + quiz_weight + exam_weight
+        if total_weight != 100:
+            activity_weight = activity_weight * (100 / total_weight)
+            quiz_weight = quiz_weight * (100 / total_weight)
+            exam_weight = exam_weight * (100 / total_weight)
+        return activity_weight, quiz_weight, exam_weight
 
     @staticmethod
     def get_by_student(student_id):
         """Get all grades for a student with component breakdown"""
-        query = """SELECT s.code, s.name, g.grade, g.remarks, g.activity_score, g.quiz_score, 
-                   g.exam_score, g.activity_weight, g.quiz_weight, g.exam_weight, 
-                   g.final_grade, g.is_component_based
-                   FROM grades g 
-                   JOIN enrollments e ON g.enrollment_id = e.id 
-                   JOIN subjects s ON e.subject_id = s.id 
-                   WHERE e.student_id = %s AND e.status = 'approved'"""
-        return db.fetch_all(query, (student_id,))
+        return db.fetch_all(Grade.BY_STUDENT_QUERY, (student_id,))
+
+    @staticmethod
+    def iter_by_student(student_id, batch_size=500):
+        """Stream get_by_student rows without buffering the whole result"""
+        return db.iter_query(Grade.BY_STUDENT_QUERY, (student_id,), batch_size)
 
     @staticmethod
     def get_by_enrollment(enrollment_id):
@@ -75,6 +131,11 @@ class Grade:
         if not result:
             return None
         
+        return Grade.detail_from_row(result)
+
+    @staticmethod
+    def detail_from_row(result):
+        """Build the display dictionary from the grade columns selected by get_by_enrollment"""
         grade_data = {
             'legacy_grade': result[0],
             'remarks': result[1],
@@ -97,23 +158,63 @@ class Grade:
             return None
         
         # Normalize weights to sum to 100
-        total_weight = activity_weight + quiz_weight + exam_weight
-        if total_weight != 100:
-            activity_weight = activity_weight * (100 / total_weight)
-            quiz_weight = quiz_weight * (100 / total_weight)
-            exam_weight = exam_weight * (100 / total_weight)
+        activity_weight, quiz_weight, exam_weight = Grade.normalize_weights(activity_weight, quiz_weight, exam_weight)
         
         return (activity_score * activity_weight / 100) + (quiz_score * quiz_weight / 100) + (exam_score * exam_weight / 100)
 
+    STATISTICS_COLUMNS = """COALESCE(SUM(gs.graded_count), 0), SUM(gs.grade_sum) / NULLIF(SUM(gs.graded_count), 0),
+                   COALESCE(SUM(gs.passed_count), 0), COALESCE(SUM(gs.failed_count), 0)"""
+
     @staticmethod
-    def get_grade_statistics():
-        """Get overall grade statistics"""
-        query = """SELECT 
-                   COUNT(*) as total_grades,
-                   AVG(CASE WHEN is_component_based = 1 THEN final_grade ELSE grade END) as avg_grade,
-                   COUNT(CASE WHEN is_component_based = 1 AND final_grade >= 75 THEN 1 
-                             WHEN is_component_based = 0 AND grade >= 75 THEN 1 END) as passed_count,
-                   COUNT(CASE WHEN is_component_based = 1 AND final_grade < 75 THEN 1 
-                             WHEN is_component_based = 0 AND grade < 75 THEN 1 END) as failed_count
-                   FROM grades WHERE (grade IS NOT NULL OR final_grade IS NOT NULL)"""
-        return db.fetch_one(query)
\ No newline at end of file
+    def get_grade_statistics(teacher_id=None, subject_id=None):
+        """
+        Get grade statistics (total, average, passed, failed) from the grade_summary table,
+        which triggers on grades keep current per subject. Optionally scoped to a teacher or subject.
+        """
+        query = f"SELECT {Grade.STATISTICS_COLUMNS} FROM grade_summary gs"
+        if subject_id is not None:
+            return db.fetch_one(query + " WHERE gs.subject_id = %s", (subject_id,))
+        if teacher_id is not None:
+            return db.fetch_one(query + " JOIN subjects s ON gs.subject_id = s.id WHERE s.teacher_id = %s", (teacher_id,))
+        return db.fetch_one(query)
+
+    @staticmethod
+    def get_subject_statistics(teacher_id):
+        """Per-subject rows (code, name, total, average, passed, failed) for a teacher's subjects"""
+        query = """SELECT s.code, s.name, gs.graded_count, gs.grade_sum / NULLIF(gs.graded_count, 0),
+                   gs.passed_count, gs.failed_count
+                   FROM subjects s JOIN grade_summary gs ON gs.subject_id = s.id
+                   WHERE s.teacher_id = %s AND gs.graded_count > 0
+                   ORDER BY s.code"""
+        return db.fetch_all(query, (teacher_id,))
+
+    @staticmethod
+    def rebuild_statistics():
+        """
+        Recompute grade_summary from the grades table and return the subject IDs whose stored
+        summary had drifted. Run it while no grades are being written.
+        """
+        query = """SELECT t.subject_id, COUNT(*), SUM(t.value),
+                   SUM(CASE WHEN t.value >= 75 THEN 1 ELSE 0 END), SUM(CASE WHEN t.value < 75 THEN 1 ELSE 0 END)
+                   FROM (SELECT e.subject_id,
+                         CASE WHEN g.is_component_based = 1 THEN g.final_grade ELSE g.grade END AS value
+                         FROM grades g JOIN enrollments e ON g.enrollment_id = e.id) t
+                   WHERE t.value IS NOT NULL
+                   GROUP BY t.subject_id"""
+        fresh = {row[0]: tuple(round(float(v), 2) for v in row[1:]) for row in db.fetch_all(query)}
+        stored = {row[0]: tuple(round(float(v), 2) for v in row[1:]) for row in db.fetch_all(
+            "SELECT subject_id, graded_count, grade_sum, passed_count, failed_count FROM grade_summary WHERE graded_count <> 0")}
+        drifted = sorted(subject_id for subject_id in fresh.keys() | stored.keys()
+                         if fresh.get(subject_id) != stored.get(subject_id))
+        rows = [(subject_id,) + values for subject_id, values in fresh.items()]
+        try:
+            # One transaction, so readers never see an empty or half-written summary.
+            with db.transaction():
+                db.execute_query("DELETE FROM grade_summary")
+                if rows:
+                    db.execute_many("""INSERT INTO grade_summary
+                                       (subject_id, graded_count, grade_sum, passed_count, failed_count)
+                                       VALUES (%s, %s, %s, %s, %s)""", rows)
+        except Error:
+            return None
+        return drifted
\ No newline at end of file
@@ -0,0 +1,88 @@
+import numpy as np
+
+class GradeEngine:
+    """
+    Vectorized counterpart of Grade.calculate_final_grade for whole classes.
+    Scores and weights are array-likes of equal length; missing scores are None/NaN.
+    """
+    PASSING_GRADE = 75
+
+    @staticmethod
+    def normalize_weights(activity_weight, quiz_weight, exam_weight):
+        """Scale each row's weights so they sum to 100, like Grade.normalize_weights"""
+        activity_weight = np.asarray(activity_weight, dtype=float)
+        quiz_weight = np.asarray(quiz_weight, dtype=float)
+        exam_weight = np.asarray(exam_weight, dtype=float)
+        # Missing (NaN) weights propagate to NaN without warnings; check_weights rejects zero totals.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total_weight = activity_weight + quiz_weight + exam_weight
+            scale = np.where(total_weight != 100, 100 / total_weight, 1.0)
+            return activity_weight * scale, quiz_weight * scale, exam_weight * scale
+
+    @staticmethod
+    def check_weights(activity_weight, quiz_weight, exam_weight):
+        """Raise ValueError unless every row's weights are non-negative and sum to more than 0"""
+        weights = np.array(np.broadcast_arrays(*(np.asarray(w, dtype=float) for w in
+                                                 (activity_weight, quiz_weight, exam_weight))))
+        if (weights < 0).any() or (weights.sum(axis=0) <= 0).any():
+            raise ValueError("Weights must be non-negative and sum to more than 0")
+
+    @staticmethod
+    def compute(activity_score, quiz_score, exam_score, activity_weight=40.0, quiz_weight=20.0, exam_weight=40.0):
+        """
+        Return (final_grade, passed, (activity_weight, quiz_weight, exam_weight)) as arrays.
+        Rows with a missing score get a NaN final grade and keep their weights as given,
+        matching the single-row path in Grade.create_or_update.
+        """
+        activity_score = np.asarray(activity_score, dtype=float)
+        quiz_score = np.asarray(quiz_score, dtype=float)
+        exam_score = np.asarray(exam_score, dtype=float)
+        shape = activity_score.shape
+        raw_weights = [np.broadcast_to(np.asarray(w, dtype=float), shape)
+                       for w in (activity_weight, quiz_weight, exam_weight)]
+        normalized = GradeEngine.normalize_weights(*raw_weights)
+
+        complete = ~(np.isnan(activity_score) | np.isnan(quiz_score) | np.isnan(exam_score))
+        # Rows with a missing score compute NaN here and are masked out below.
+        with np.errstate(invalid='ignore'):
+            final_grade = (activity_score * normalized[0] / 100) + (quiz_score * normalized[1] / 100) + (exam_score * normalized[2] / 100)
+            final_grade = np.where(complete, final_grade, np.nan)
+            passed = final_grade >= GradeEngine.PASSING_GRADE
+        weights = tuple(np.where(complete, n, r) for n, r in zip(normalized, raw_weights))
+        return final_grade, passed, weights
+
+    @staticmethod
+    def upsert_rows(enrollment_ids, activity_score, quiz_score, exam_score, activity_weight=40.0, quiz_weight=20.0, exam_weight=40.0, remarks=None):
+        """Compute a whole class in one pass and return parameter tuples for Grade.COMPONENT_UPSERT"""
+        activity_score = np.round(GradeEngine._floats(activity_score), 2)
+        quiz_score = np.round(GradeEngine._floats(quiz_score), 2)
+        exam_score = np.round(GradeEngine._floats(exam_score), 2)
+        final_grade, passed, weights = GradeEngine.compute(activity_score, quiz_score, exam_score,
+                                                           activity_weight, quiz_weight, exam_weight)
+        # Scores, weights and final grade are rounded to the decimal(5,2) columns, so SQLite
+        # (which stores REAL) keeps the same values MySQL would and remarks match the stored grade.
+        final_grade = np.round(final_grade, 2)
+        weights = tuple(np.round(w, 2) for w in weights)
+        with np.errstate(invalid='ignore'):
+            passed = final_grade >= GradeEngine.PASSING_GRADE
+        complete = ~np.isnan(final_grade)
+        computed_remarks = np.where(passed, "Passed", "Failed").tolist()
+        if remarks is None:
+            remarks = [None] * len(computed_remarks)
+
+        columns = [GradeEngine._values(activity_score), GradeEngine._values(quiz_score), GradeEngine._values(exam_score),
+                   weights[0].tolist(), weights[1].tolist(), weights[2].tolist(), GradeEngine._values(final_grade)]
+        return [
+            (enrollment_id, a, q, e, aw, qw, ew, f, computed if is_complete else given, True)
+            for enrollment_id, a, q, e, aw, qw, ew, f, computed, given, is_complete
+            in zip(enrollment_ids, *columns, computed_remarks, remarks, complete.tolist())
+        ]
+
+    @staticmethod
+    def _floats(values):
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+
+    @staticmethod
+    def _values(array):
+        """Plain Python floats for the driver, with NaN turned back into NULL"""
+        return [None if v != v else v for v in array.tolist()]
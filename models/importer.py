@@ -0,0 +1,250 @@
+import csv
+import time
+from database import Error, db
+from models.user import UserIdAllocator
+from models.enrollment import Enrollment
+from models.grade import Grade
+from models.grading import GradeEngine
+
+class UserImporter:
+    """
+    Stream students or teachers from a CSV file with a header row. Rows are validated against
+    emails and courses preloaded into memory, given IDs from reserved blocks and inserted with
+    execute_many, one transaction per chunk. Invalid rows are collected in rejects as
+    (line, reason, row) instead of stopping the import.
+    """
+    COLUMNS = {
+        'student': ('name', 'email', 'password', 'course_id', 'year_level'),
+        'teacher': ('name', 'email', 'password', 'position')
+    }
+    TABLES = {'student': 'students', 'teacher': 'teachers'}
+
+    def __init__(self, role, chunk_size=1000):
+        if role not in self.COLUMNS:
+            raise ValueError(f"Unknown role: {role}")
+        self.role = role
+        self.table = self.TABLES[role]
+        self.columns = self.COLUMNS[role]
+        self.chunk_size = chunk_size
+        self.user_ids = UserIdAllocator(block_size=chunk_size)
+        self.rejects = []
+        self.imported = 0
+        self.query = (f"INSERT INTO {self.table} (user_id, {', '.join(self.columns)}) "
+                      f"VALUES ({', '.join(['%s'] * (len(self.columns) + 1))})")
+
+    def run(self, path):
+        started = time.perf_counter()
+        self.rejects = []
+        self.imported = 0
+        self.emails = {row[0].lower() for row in db.iter_query(f"SELECT email FROM {self.table}")}
+        self.courses = {}
+        if self.role == 'student':
+            for course_id, name in db.iter_query("SELECT id, name FROM courses"):
+                self.courses[str(course_id)] = course_id
+                self.courses[name.lower()] = course_id
+
+        with open(path, newline='', encoding='utf-8-sig') as source:
+            reader = csv.DictReader(source)
+            if reader.fieldnames is None:
+                raise ValueError("The file is empty")
+            reader.fieldnames = [field.strip().lower() for field in reader.fieldnames]
+            missing = [column for column in self.columns if column not in reader.fieldnames and column != 'position']
+            if missing:
+                raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+            chunk = []
+            for row in reader:
+                line = reader.line_num
+                values, reason = self._validate(row)
+                if reason:
+                    self.rejects.append((line, reason, row))
+                    continue
+                chunk.append((line, values, row))
+                if len(chunk) >= self.chunk_size:
+                    self._flush(chunk)
+            self._flush(chunk)
+
+        return {'imported': self.imported, 'rejected': len(self.rejects),
+                'seconds': round(time.perf_counter() - started, 2)}
+
+    def _validate(self, row):
+        values = {column: (row.get(column) or '').strip() for column in self.columns}
+        if not values['name']:
+            return None, "name is required"
+        email = values['email'].lower()
+        if '@' not in email:
+            return None, "invalid email"
+        if email in self.emails:
+            return None, "email already in use"
+        if not values['password']:
+            return None, "password is required"
+        if self.role == 'student':
+            course_id = self.courses.get(values['course_id'].lower())
+            if course_id is None:
+                return None, f"unknown course: {values['course_id']}"
+            values['course_id'] = course_id
+            if not values['year_level'].isdigit() or int(values['year_level']) < 1:
+                return None, "year_level must be a positive number"
+            values['year_level'] = int(values['year_level'])
+        else:
+            values['position'] = values['position'] or None
+        self.emails.add(email)
+        return tuple(values[column] for column in self.columns), None
+
+    def _flush(self, chunk):
+        if not chunk:
+            return
+        pending = []
+        for line, values, row in chunk:
+            user_id = self.user_ids.next_id()
+            if user_id is None:
+                self.rejects.append((line, "no user ID available", row))
+            else:
+                pending.append((line, (user_id,) + values, row))
+        chunk.clear()
+        if not pending:
+            return
+        try:
+            with db.transaction():
+                db.execute_many(self.query, [params for line, params, row in pending])
+            self.imported += len(pending)
+        except Error:
+            # Something changed under us (e.g. an email added concurrently): retry row by row
+            # so only the offending rows are rejected.
+            for line, params, row in pending:
+                if db.execute_query(self.query, params) is None:
+                    self.rejects.append((line, "rejected by the database", row))
+                else:
+                    self.imported += 1
+
+    def write_rejects(self, path):
+        """Write the rejected rows with their line number and reason, for fixing and re-importing"""
+        with open(path, 'w', newline='', encoding='utf-8') as target:
+            writer = csv.writer(target)
+            writer.writerow(('line', 'reason') + self.columns)
+            for line, reason, row in self.rejects:
+                writer.writerow((line, reason) + tuple(row.get(column, '') for column in self.columns))
+
+class GradeSheetImporter:
+    """
+    Load component scores for one subject from a CSV or TSV grade sheet. Rows are keyed by
+    enrollment_id or the student's user_id and matched against the roster fetched in one query.
+    Final grades for the whole sheet are computed with GradeEngine, and load() only stages the
+    rows that differ from what is stored; apply() writes them in one transaction.
+    Blank cells keep the stored value; weights default to the stored ones, then 40/20/40.
+    Rows without any score are skipped, so legacy single grades are only converted to
+    component grades when the sheet supplies scores for them.
+    """
+    KEYS = ('enrollment_id', 'user_id')
+    COLUMNS = ('activity', 'quiz', 'exam', 'activity_weight', 'quiz_weight', 'exam_weight')
+    ALIASES = {'activity_score': 'activity', 'quiz_score': 'quiz', 'exam_score': 'exam'}
+    DEFAULT_WEIGHTS = (40.0, 20.0, 40.0)
+
+    def __init__(self, teacher_id, subject_id):
+        self.teacher_id = teacher_id
+        self.subject_id = subject_id
+        self.changes = []
+        self.rejects = []
+        self.unchanged = 0
+        self._params = []
+
+    def load(self, path):
+        """Parse the sheet and stage the changes; returns counts of new, changed, unchanged and rejected rows"""
+        self.changes = []
+        self.rejects = []
+        self.unchanged = 0
+        self._params = []
+        roster = {}
+        by_user_id = {}
+        for row in Enrollment.get_grade_sheet(self.teacher_id, self.subject_id):
+            roster[row[0]] = row
+            by_user_id[row[1]] = row[0]
+
+        entries = {}
+        with open(path, newline='', encoding='utf-8-sig') as source:
+            first_line = source.readline()
+            source.seek(0)
+            delimiter = '\t' if path.lower().endswith('.tsv') or '\t' in first_line else ','
+            reader = csv.DictReader(source, delimiter=delimiter)
+            if reader.fieldnames is None:
+                raise ValueError("The file is empty")
+            reader.fieldnames = [self.ALIASES.get(f.strip().lower(), f.strip().lower()) for f in reader.fieldnames]
+            key = next((k for k in self.KEYS if k in reader.fieldnames), None)
+            if key is None:
+                raise ValueError("The sheet needs an enrollment_id or user_id column")
+            missing = [column for column in self.COLUMNS[:3] if column not in reader.fieldnames]
+            if missing:
+                raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+            for row in reader:
+                line = reader.line_num
+                value = (row.get(key) or '').strip()
+                if key == 'enrollment_id':
+                    enrollment_id = int(value) if value.isdigit() else None
+                else:
+                    enrollment_id = by_user_id.get(value)
+                if enrollment_id not in roster:
+                    self.rejects.append((line, f"{key} {value} is not on this subject's roster", row))
+                    continue
+                if enrollment_id in entries:
+                    self.rejects.append((line, f"duplicate row for {key} {value}", row))
+                    continue
+                if not any((row.get(column) or '').strip() for column in self.COLUMNS[:3]):
+                    # No scores on this row (ungraded, or a legacy single grade): leave it as stored.
+                    self.unchanged += 1
+                    continue
+                values, reason = self._validate(row, roster[enrollment_id])
+                if reason:
+                    self.rejects.append((line, reason, row))
+                    continue
+                entries[enrollment_id] = values
+
+        if entries:
+            enrollment_ids = list(entries)
+            params = GradeEngine.upsert_rows(enrollment_ids, *zip(*entries.values()),
+                                             remarks=[roster[e][10] for e in enrollment_ids])
+            for row in params:
+                current = roster[row[0]]
+                stored = tuple(None if v is None else round(float(v), 2) for v in current[3:10])
+                computed = tuple(None if v is None else round(float(v), 2) for v in row[1:8])
+                if stored == computed:
+                    self.unchanged += 1
+                    continue
+                self._params.append(row)
+                self.changes.append((row[0], current[2], stored[6], row[7], row[8], current[3] is None and current[9] is None))
+
+        new = sum(1 for change in self.changes if change[5])
+        return {'new': new, 'changed': len(self.changes) - new, 'unchanged': self.unchanged, 'rejected': len(self.rejects)}
+
+    def _validate(self, row, current):
+        values = []
+        for i, column in enumerate(self.COLUMNS):
+            cell = (row.get(column) or '').strip()
+            stored = current[3 + i]
+            if not cell:
+                if stored is None and i >= 3:
+                    stored = self.DEFAULT_WEIGHTS[i - 3]
+                values.append(None if stored is None else float(stored))
+                continue
+            try:
+                values.append(float(cell))
+            except ValueError:
+                return None, f"{column} is not a number: {cell}"
+        if any(v is not None and not 0 <= v <= 100 for v in values[:3]):
+            return None, "scores must be between 0-100"
+        if any(v < 0 for v in values[3:]) or sum(values[3:]) <= 0:
+            return None, "weights must be non-negative and not all zero"
+        if current[11] == 0 and current[9] is not None and None in values[:3]:
+            return None, "has a single grade; supply all three scores to replace it"
+        return tuple(values), None
+
+    def apply(self):
+        """Write the staged rows in one transaction; returns the number of grades written or None on failure"""
+        if not self._params:
+            return 0
+        try:
+            with db.transaction():
+                db.execute_many(Grade.COMPONENT_UPSERT, self._params)
+        except Error:
+            return None
+        return len(self._params)
\ No newline at end of file
@@ -1,32 +1,86 @@
 from database import db
+from models.cache import subject_cache
 
 class Subject:
+    LIST_QUERY = "SELECT s.id, s.code, s.name, s.description, t.name, c.name, s.capacity FROM subjects s LEFT JOIN teachers t ON s.teacher_id = t.id LEFT JOIN courses c ON s.course_id = c.id"
+
+    RECOUNT_QUERY = """UPDATE subjects SET seats_taken =
+                   (SELECT COUNT(*) FROM enrollments e WHERE e.subject_id = subjects.id AND e.status <> 'denied')"""
+
     @staticmethod
-    def create(code, name, description, teacher_id, course_id):
-        query = "INSERT INTO subjects (code, name, description, teacher_id, course_id) VALUES (%s, %s, %s, %s, %s)"
-        return db.execute_query(query, (code, name, description, teacher_id, course_id))
+    def create(code, name, description, teacher_id, course_id, capacity=None):
+        """capacity=None leaves the subject without a seat limit"""
+        query = "INSERT INTO subjects (code, name, description, teacher_id, course_id, capacity) VALUES (%s, %s, %s, %s, %s, %s)"
+        result = db.execute_query(query, (code, name, description, teacher_id, course_id, capacity))
+        subject_cache.invalidate()
+        return result
 
     @staticmethod
     def get_by_teacher(teacher_id):
-        return db.fetch_all("SELECT s.id, s.code, s.name, s.description, c.name FROM subjects s LEFT JOIN courses c ON s.course_id = c.id WHERE s.teacher_id = %s", (teacher_id,))
+        return subject_cache.get_or_load(('teacher', teacher_id), lambda: db.fetch_all(
+            "SELECT s.id, s.code, s.name, s.description, c.name, s.capacity FROM subjects s LEFT JOIN courses c ON s.course_id = c.id WHERE s.teacher_id = %s", (teacher_id,)))
 
     @staticmethod
     def get_all():
-        return db.fetch_all("SELECT s.id, s.code, s.name, s.description, t.name, c.name FROM subjects s LEFT JOIN teachers t ON s.teacher_id = t.id LEFT JOIN courses c ON s.course_id = c.id")
+        return subject_cache.get_or_load(('all',), lambda: db.fetch_all(Subject.LIST_QUERY))
+
+    @staticmethod
+    def get_page(after=None, before=None, limit=20):
+        return subject_cache.get_or_load(('page', after, before, limit),
+                                         lambda: db.fetch_page(Subject.LIST_QUERY, "s.id", after, before, limit))
+
+    @staticmethod
+    def iter_all(batch_size=500):
+        return db.iter_query(Subject.LIST_QUERY, batch_size=batch_size)
 
     @staticmethod
     def get_by_id(subject_id):
-        return db.fetch_one("SELECT id, code, name, description, teacher_id, course_id FROM subjects WHERE id = %s", (subject_id,))
+        return subject_cache.get_or_load(('id', subject_id), lambda: db.fetch_one(
+            "SELECT id, code, name, description, teacher_id, course_id FROM subjects WHERE id = %s", (subject_id,)))
 
     @staticmethod
-    def update(subject_id, code, name, description, course_id):
-        query = "UPDATE subjects SET code = %s, name = %s, description = %s, course_id = %s WHERE id = %s"
-        return db.execute_query(query, (code, name, description, course_id, subject_id))
+    def update(subject_id, code, name, description, course_id, capacity=None):
+        query = "UPDATE subjects SET code = %s, name = %s, description = %s, course_id = %s, capacity = %s WHERE id = %s"
+        result = db.execute_query(query, (code, name, description, course_id, capacity, subject_id))
+        subject_cache.invalidate()
+        return result
 
     @staticmethod
     def delete(subject_id):
-        return db.execute_query("DELETE FROM subjects WHERE id = %s", (subject_id,))
+        result = db.execute_query("DELETE FROM subjects WHERE id = %s", (subject_id,))
+        subject_cache.invalidate()
+        return result
 
     @staticmethod
     def get_enrolled_by_student(student_id):
-        return db.fetch_all("SELECT s.code, s.name, e.status FROM subjects s JOIN enrollments e ON s.id = e.subject_id WHERE e.student_id = %s", (student_id,))
\ No newline at end of file
+        return db.fetch_all("SELECT s.code, s.name, e.status FROM subjects s JOIN enrollments e ON s.id = e.subject_id WHERE e.student_id = %s", (student_id,))
+
+    @staticmethod
+    def reserve_seats(subject_id, count=1):
+        """
+        Take up to count seats with a conditional UPDATE on the subject's counter row, so no two
+        callers can overbook it. Returns the number of seats taken, or None if there is no such subject.
+        """
+        while count > 0:
+            # Full requests take one statement; only a nearly full subject needs the partial retry.
+            if db.execute_query("""UPDATE subjects SET seats_taken = seats_taken + %s
+                                   WHERE id = %s AND (capacity IS NULL OR seats_taken + %s <= capacity)""",
+                                (count, subject_id, count)) == 1:
+                return count
+            row = db.fetch_one("SELECT capacity - seats_taken FROM subjects WHERE id = %s", (subject_id,))
+            if row is None:
+                return None
+            if row[0] is None or row[0] <= 0:
+                return 0
+            count = min(count, row[0])
+        return 0
+
+    @staticmethod
+    def recount_seats(subject_id=None, teacher_id=None):
+        """Reset seats_taken to the subject's pending and approved enrollments; all subjects when unscoped"""
+        query = Subject.RECOUNT_QUERY
+        if subject_id is not None:
+            return db.execute_query(query + " WHERE id = %s", (subject_id,))
+        if teacher_id is not None:
+            return db.execute_query(query + " WHERE teacher_id = %s", (teacher_id,))
+        return db.execute_query(query)
\ No newline at end of file
@@ -1,58 +1,145 @@
 # models/user.py:
-import random
+import hmac
+import threading
+from collections import deque
 from database import db
+from models.cache import subject_cache
+
+class UserIdAllocator:
+    """Hands out 6-digit user IDs from blocks reserved on the id_sequences table"""
+    def __init__(self, sequence='user_id', block_size=50, max_value=999999):
+        self.sequence = sequence
+        self.block_size = block_size
+        self.max_value = max_value
+        self._lock = threading.Lock()
+        self._free = deque()
+
+    def next_id(self):
+        with self._lock:
+            if not self._free:
+                if db.joins_transaction():
+                    # The reservation rolls back with the caller's transaction, so the block
+                    # must not outlive it either or another allocator would get the same IDs.
+                    db.on_rollback(self._forget)
+                self._free.extend(self._reserve_block())
+            if not self._free:
+                return None
+            return self._free.popleft()
+
+    def _forget(self):
+        with self._lock:
+            self._free.clear()
+
+    def _reserve_block(self):
+        while True:
+            # The row lock taken by the UPDATE makes each block exclusive to one caller.
+            # An isolated session keeps the reservation committed even if the caller rolls back.
+            with db.session(isolated=True):
+                updated = db.execute_query(
+                    "UPDATE id_sequences SET next_value = LAST_INSERT_ID(next_value + %s) WHERE name = %s",
+                    (self.block_size, self.sequence))
+                if updated != 1:
+                    return []
+                row = db.fetch_one("SELECT LAST_INSERT_ID()")
+            if not row:
+                return []
+            end = row[0]
+            start = end - self.block_size
+            if start > self.max_value:
+                return []
+            end = min(end, self.max_value + 1)
+            candidates = [f"{value:06d}" for value in range(start, end)]
+            # IDs handed out by the old random generator may already sit inside the block.
+            taken = User.ids_in_range(candidates[0], candidates[-1])
+            free = [user_id for user_id in candidates if user_id not in taken]
+            if free:
+                return free
 
 class User:
     @staticmethod
     def generate_id():
-        while True:
-            user_id = str(random.randint(100000, 999999))
-            if not User.id_exists(user_id):
-                return user_id
+        return user_ids.next_id()
 
     @staticmethod
     def id_exists(user_id):
-        tables = ['admins', 'teachers', 'students']
-        for table in tables:
-            result = db.fetch_one(f"SELECT user_id FROM {table} WHERE user_id = %s", (user_id,))
-            if result:
-                return True
-        return False
+        return bool(User.ids_in_range(user_id, user_id))
+
+    @staticmethod
+    def ids_in_range(first_id, last_id):
+        query = """SELECT user_id FROM admins WHERE user_id BETWEEN %s AND %s
+                   UNION ALL
+                   SELECT user_id FROM teachers WHERE user_id BETWEEN %s AND %s
+                   UNION ALL
+                   SELECT user_id FROM students WHERE user_id BETWEEN %s AND %s"""
+        rows = db.fetch_all(query, (first_id, last_id) * 3)
+        return {row[0] for row in rows}
 
     @staticmethod
     def authenticate(user_id, password):
-        tables = [('admins', 'admin'), ('teachers', 'teacher'), ('students', 'student')]
-        for table, role in tables:
-            result = db.fetch_one(f"SELECT id, name FROM {table} WHERE user_id = %s AND password = %s", (user_id, password))
-            if result:
-                return {'id': result[0], 'name': result[1], 'role': role, 'user_id': user_id}
+        # One round trip: each branch is a lookup on the table's unique user_id key.
+        query = """SELECT 'admin', id, name, password FROM admins WHERE user_id = %s
+                   UNION ALL
+                   SELECT 'teacher', id, name, password FROM teachers WHERE user_id = %s
+                   UNION ALL
+                   SELECT 'student', id, name, password FROM students WHERE user_id = %s"""
+        rows = db.fetch_all(query, (user_id, user_id, user_id))
+        for role in ('admin', 'teacher', 'student'):
+            for row in rows:
+                if row[0] == role and hmac.compare_digest(str(row[3]).encode(), password.encode()):
+                    return {'id': row[1], 'name': row[2], 'role': role, 'user_id': user_id}
         return None
 
 class Admin:
+    TEACHERS_QUERY = "SELECT id, user_id, name, email, position FROM teachers"
+    STUDENTS_QUERY = "SELECT s.id, s.user_id, s.name, s.email, c.name, s.year_level FROM students s LEFT JOIN courses c ON s.course_id = c.id"
+
     @staticmethod
     def create_teacher(name, email, password, position):
         user_id = User.generate_id()
+        if user_id is None:
+            return None
         query = "INSERT INTO teachers (user_id, name, email, password, position) VALUES (%s, %s, %s, %s, %s)"
         return db.execute_query(query, (user_id, name, email, password, position))
 
     @staticmethod
     def create_student(name, email, password, course_id, year_level):
         user_id = User.generate_id()
+        if user_id is None:
+            return None
         query = "INSERT INTO students (user_id, name, email, password, course_id, year_level) VALUES (%s, %s, %s, %s, %s, %s)"
         return db.execute_query(query, (user_id, name, email, password, course_id, year_level))
 
     @staticmethod
     def get_teachers():
-        return db.fetch_all("SELECT id, user_id, name, email, position FROM teachers")
+        return db.fetch_all(Admin.TEACHERS_QUERY)
+
+    @staticmethod
+    def get_teachers_page(after=None, before=None, limit=20):
+        return db.fetch_page(Admin.TEACHERS_QUERY, "id", after, before, limit)
+
+    @staticmethod
+    def iter_teachers(batch_size=500):
+        return db.iter_query(Admin.TEACHERS_QUERY, batch_size=batch_size)
 
     @staticmethod
     def get_students():
-        return db.fetch_all("SELECT s.id, s.user_id, s.name, s.email, c.name, s.year_level FROM students s LEFT JOIN courses c ON s.course_id = c.id")
+        return db.fetch_all(Admin.STUDENTS_QUERY)
+
+    @staticmethod
+    def get_students_page(after=None, before=None, limit=20):
+        return db.fetch_page(Admin.STUDENTS_QUERY, "s.id", after, before, limit)
+
+    @staticmethod
+    def iter_students(batch_size=500):
+        return db.iter_query(Admin.STUDENTS_QUERY, batch_size=batch_size)
 
     @staticmethod
     def update_teacher(user_id, name, email, password, position):
         query = "UPDATE teachers SET name = %s, email = %s, password = %s, position = %s WHERE user_id = %s"
-        return db.execute_query(query, (name, email, password, position, user_id))
+        result = db.execute_query(query, (name, email, password, position, user_id))
+        # Subject listings show the teacher's name.
+        subject_cache.invalidate()
+        return result
 
     @staticmethod
     def update_student(user_id, name, email, password, course_id, year_level):
@@ -61,7 +148,9 @@ class Admin:
 
     @staticmethod
     def delete_teacher(user_id):
-        return db.execute_query("DELETE FROM teachers WHERE user_id = %s", (user_id,))
+        result = db.execute_query("DELETE FROM teachers WHERE user_id = %s", (user_id,))
+        subject_cache.invalidate()
+        return result
 
     @staticmethod
     def delete_student(user_id):
@@ -75,4 +164,6 @@ class Teacher:
 class Student:
     @staticmethod
     def get_by_user_id(user_id):
-        return db.fetch_one("SELECT s.id, s.name, c.name, s.year_level FROM students s LEFT JOIN courses c ON s.course_id = c.id WHERE s.user_id = %s", (user_id,))
\ No newline at end of file
+        return db.fetch_one("SELECT s.id, s.name, c.name, s.year_level FROM students s LEFT JOIN courses c ON s.course_id = c.id WHERE s.user_id = %s", (user_id,))
+
+user_ids = UserIdAllocator()
\ No newline at end of file
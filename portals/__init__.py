@@ -1,3 +1,4 @@
 from .admin import AdminPortal
 from .teacher import TeacherPortal
-from .student import StudentPortal
\ No newline at end of file
+from .student import StudentPortal
+from .session import run_session
\ No newline at end of file
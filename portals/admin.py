@@ -1,7 +1,13 @@
 # portals/admin.py:
-from utils import Display
+import time
+from utils import Display, Pager, files
 from models.user import Admin
 from models.course import Course
+from models.cache import caches
+from models.importer import UserImporter
+from models.exporter import GradeExporter
+from models.admission import admissions
+from database import db
 
 class AdminPortal:
     def __init__(self, user):
@@ -14,7 +20,9 @@ class AdminPortal:
             self.display.menu([
                 "Manage Teachers",
                 "Manage Students", 
-                "Manage Courses"
+                "Manage Courses",
+                "System Diagnostics",
+                "Export All Grades"
             ])
             
             choice = input("\nEnter choice: ")
@@ -24,6 +32,10 @@ class AdminPortal:
                 self.manage_students()
             elif choice == '3':
                 self.manage_courses()
+            elif choice == '4':
+                self.view_diagnostics()
+            elif choice == '5':
+                self.export_grades()
             elif choice == '0':
                 break
 
@@ -35,7 +47,8 @@ class AdminPortal:
                 "View Teachers",
                 "Add Teacher",
                 "Update Teacher",
-                "Delete Teacher"
+                "Delete Teacher",
+                "Import Teachers from CSV"
             ])
             
             choice = input("\nEnter choice: ")
@@ -47,18 +60,19 @@ class AdminPortal:
                 self.update_teacher()
             elif choice == '4':
                 self.delete_teacher()
+            elif choice == '5':
+                self.import_users('teacher')
             elif choice == '0':
                 break
 
     def view_teachers(self):
-        teachers = Admin.get_teachers()
-        if teachers:
-            self.display.table_header(["ID", "User ID", "Name", "Email", "Position"])
-            for t in teachers:
-                self.display.table_row([t[0], t[1], t[2], t[3], t[4] or "N/A"])
-        else:
+        if Pager(Admin.get_teachers_page, self.render_teachers).run() is None:
             self.display.info("No teachers found")
-        input("\nPress Enter to continue...")
+            input("\nPress Enter to continue...")
+
+    def render_teachers(self, teachers):
+        self.display.table(["ID", "User ID", "Name", "Email", "Position"],
+                           [[t[0], t[1], t[2], t[3], t[4] or "N/A"] for t in teachers])
 
     def add_teacher(self):
         name = input("Teacher Name: ")
@@ -141,7 +155,8 @@ class AdminPortal:
                 "View Students",
                 "Add Student",
                 "Update Student",
-                "Delete Student"
+                "Delete Student",
+                "Import Students from CSV"
             ])
             
             choice = input("\nEnter choice: ")
@@ -153,18 +168,19 @@ class AdminPortal:
                 self.update_student()
             elif choice == '4':
                 self.delete_student()
+            elif choice == '5':
+                self.import_users('student')
             elif choice == '0':
                 break
 
     def view_students(self):
-        students = Admin.get_students()
-        if students:
-            self.display.table_header(["ID", "User ID", "Name", "Email", "Course", "Year"])
-            for s in students:
-                self.display.table_row([s[0], s[1], s[2], s[3], s[4] or "N/A", s[5]])
-        else:
+        if Pager(Admin.get_students_page, self.render_students).run() is None:
             self.display.info("No students found")
-        input("\nPress Enter to continue...")
+            input("\nPress Enter to continue...")
+
+    def render_students(self, students):
+        self.display.table(["ID", "User ID", "Name", "Email", "Course", "Year"],
+                           [[s[0], s[1], s[2], s[3], s[4] or "N/A", s[5]] for s in students])
 
     def add_student(self):
         self.view_courses()
@@ -249,6 +265,64 @@ class AdminPortal:
         input("\nPress Enter to continue...")
 
 
+    # --- Bulk Import ---
+    def import_users(self, role):
+        columns = ", ".join(UserImporter.COLUMNS[role])
+        self.display.info(f"Expected CSV header: {columns}")
+        path = input("CSV file path: ")
+        if not path:
+            self.display.info("Operation cancelled.")
+            return
+        path = files.resolve_or_report(self.display, path)
+        if path is None:
+            input("\nPress Enter to continue...")
+            return
+
+        importer = UserImporter(role)
+        try:
+            result = importer.run(path)
+        except (OSError, ValueError) as error:
+            self.display.error(f"Import failed: {error}")
+            input("\nPress Enter to continue...")
+            return
+
+        self.display.success(f"Imported {result['imported']} {role}s in {result['seconds']} s")
+        if importer.rejects:
+            self.display.error(f"{result['rejected']} rows rejected")
+            self.display.table(["Line", "Reason", "Email"],
+                               [[line, reason, row.get('email', '')] for line, reason, row in importer.rejects[:20]])
+            rejects_path = input("Save rejected rows to (blank to skip): ")
+            if rejects_path:
+                target = files.resolve_or_report(self.display, rejects_path)
+                if target is not None:
+                    importer.write_rejects(target)
+                    self.display.success(f"Rejected rows written to {rejects_path}")
+        input("\nPress Enter to continue...")
+
+    def export_grades(self):
+        fmt = input("Format (csv/jsonl) [csv]: ").strip().lower() or 'csv'
+        if fmt not in GradeExporter.FORMATS:
+            self.display.error("Unknown format")
+            input("\nPress Enter to continue...")
+            return
+        path = input(f"Output file [grades.{fmt}]: ").strip() or f"grades.{fmt}"
+        path = files.resolve_or_report(self.display, path)
+        if path is None:
+            input("\nPress Enter to continue...")
+            return
+
+        started = time.perf_counter()
+        try:
+            count = GradeExporter(fmt).full_dump(path)
+        except OSError as error:
+            self.display.error(f"Export failed: {error}")
+            count = None
+        if count is None:
+            self.display.error("Failed to export grades")
+        else:
+            self.display.success(f"{count} grades written to {path} in {time.perf_counter() - started:.1f} s")
+        input("\nPress Enter to continue...")
+
     # --- Course Management ---
     def manage_courses(self):
         while True:
@@ -273,14 +347,13 @@ class AdminPortal:
                 break
 
     def view_courses(self):
-        courses = Course.get_all()
-        if courses:
-            self.display.table_header(["ID", "Name", "Description"])
-            for c in courses:
-                self.display.table_row([c[0], c[1], c[2] or "N/A"])
-        else:
+        if Pager(Course.get_page, self.render_courses).run() is None:
             self.display.info("No courses found")
-        input("\nPress Enter to continue...")
+            input("\nPress Enter to continue...")
+
+    def render_courses(self, courses):
+        self.display.table(["ID", "Name", "Description"],
+                           [[c[0], c[1], c[2] or "N/A"] for c in courses])
 
     def add_course(self):
         name = input("Course Name: ")
@@ -330,4 +403,28 @@ class AdminPortal:
             self.display.success("Course deleted successfully!")
         else:
             self.display.error("Failed to delete course")
-        input("\nPress Enter to continue...")
\ No newline at end of file
+        input("\nPress Enter to continue...")
+
+    # --- Diagnostics ---
+    def view_diagnostics(self):
+        self.display.header("SYSTEM DIAGNOSTICS")
+        print("Query statistics (slowest total time first):")
+        print(db.stats.report())
+
+        if db.stats.slow_queries:
+            print(f"\nRecent slow queries (>= {db.stats.slow_query_ms} ms):")
+            for logged_at, elapsed_ms, origin, statement in db.stats.slow_queries:
+                print(f"{time.strftime('%H:%M:%S', time.localtime(logged_at))} {elapsed_ms:8.1f} ms  {origin}  {statement[:80]}")
+
+        self.display.table(["Cache", "Hits", "Misses", "Hit Rate", "Entries", "Invalidations"],
+                           [[c['name'], c['hits'], c['misses'], f"{c['hit_rate']:.1%}", c['size'], c['invalidations']]
+                            for c in (cache.stats() for cache in caches)])
+
+        queue_stats = admissions.stats()
+        print(f"\nAdmission queue: depth {queue_stats['depth']}, {queue_stats['processed']} requests in "
+              f"{queue_stats['batches']} batches (mean {queue_stats['mean_batch']:.1f}, largest {queue_stats['largest_batch']}), "
+              f"wait p50 {queue_stats['wait_p50_ms']:.1f} ms / p95 {queue_stats['wait_p95_ms']:.1f} ms / max {queue_stats['wait_max_ms']:.1f} ms")
+
+        if input("\nReset query statistics? (y/n): ").lower() == 'y':
+            db.stats.reset()
+            self.display.success("Query statistics reset")
\ No newline at end of file
@@ -0,0 +1,229 @@
+import logging
+import random
+import threading
+import time
+from database import db
+from models.admission import admissions
+from utils import console
+from .session import run_session
+
+logger = logging.getLogger('lms.loadtest')
+
+class ScriptedConsole:
+    """
+    Console for one virtual user. readline() hands out the next scripted input and times the
+    previous one: an action's latency runs from its input being returned until the portal asks
+    for the next input (or the session ends), which is what a user would wait for.
+    """
+    def __init__(self, steps, recorder):
+        self.steps = list(steps)
+        self.recorder = recorder
+        self.output_bytes = 0
+        self._position = 0
+        self._action = None
+        self._started = 0.0
+
+    def write(self, text):
+        self.output_bytes += len(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    def readline(self, size=-1):
+        self.finish()
+        if self.done:
+            return ''
+        self._action, line = self.steps[self._position]
+        self._position += 1
+        self.recorder.start_action()
+        self._started = time.perf_counter()
+        return line + '\n'
+
+    @property
+    def done(self):
+        return self._position >= len(self.steps)
+
+    def finish(self):
+        if self._action is not None:
+            self.recorder.add(self._action, (time.perf_counter() - self._started) * 1000)
+            self._action = None
+
+class LoadRecorder:
+    """
+    Collects action latencies and counts the DB queries each thread issues during an action.
+    Queries the admission worker runs for a batch are shared out over the batch's requests and
+    charged to the action that submitted them.
+    """
+    def __init__(self):
+        self.latencies = {}
+        self.queries = {}
+        self.errors = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._charged = {}
+
+    def on_query(self, key, elapsed_ms, rows, error):
+        self._local.queries = getattr(self._local, 'queries', 0) + 1
+        if error is not None:
+            with self._lock:
+                self.errors += 1
+
+    def on_admission_batch(self, batch):
+        # Runs on the admission worker, whose own counter holds the queries of this batch.
+        share = getattr(self._local, 'queries', 0) / len(batch)
+        self._local.queries = 0
+        with self._lock:
+            for request in batch:
+                self._charged[request.thread] = self._charged.get(request.thread, 0) + share
+
+    def start_action(self):
+        self._local.queries = 0
+        with self._lock:
+            self._charged.pop(threading.get_ident(), None)
+
+    def add(self, action, elapsed_ms):
+        queries = getattr(self._local, 'queries', 0)
+        with self._lock:
+            queries += self._charged.pop(threading.get_ident(), 0)
+            self.latencies.setdefault(action, []).append(elapsed_ms)
+            self.queries[action] = self.queries.get(action, 0) + queries
+
+class LoadTest:
+    """
+    Drive the real portals with N concurrent virtual users, each running one scripted session
+    through run_session() with its console bound to a ScriptedConsole. Credentials and subjects
+    are sampled from seeded data (see tools/seed.py). Use a pooled db so sessions run in parallel.
+    """
+    def __init__(self, users=100, mix=None, seed=42):
+        self.users = users
+        self.mix = mix or {'student': 80, 'teacher': 15, 'admin': 5}
+        self.random = random.Random(seed)
+
+    def sample(self):
+        students = db.fetch_all("SELECT user_id, password FROM students ORDER BY id DESC LIMIT %s", (self.users,))
+        teachers = db.fetch_all("""SELECT t.user_id, t.password FROM teachers t
+                                   WHERE EXISTS (SELECT 1 FROM subjects s WHERE s.teacher_id = t.id)
+                                   ORDER BY t.id DESC LIMIT %s""", (self.users,))
+        admins = db.fetch_all("SELECT user_id, password FROM admins")
+        subjects = [row[0] for row in db.fetch_all("SELECT id FROM subjects ORDER BY id DESC LIMIT 500")]
+        if not students or not teachers or not subjects:
+            raise RuntimeError("Load test needs seeded data; run 'python manage.py seed' first")
+        return {'student': students, 'teacher': teachers, 'admin': admins, 'subjects': subjects}
+
+    def student_script(self, credentials, subjects):
+        return [
+            ("login.user_id", credentials[0]), ("login", credentials[1]),
+            ("student.enrolled_subjects", "1"), ("menu", ""),
+            ("student.browse_subjects", "4"), ("student.enroll", str(self.random.choice(subjects))), ("menu", ""),
+            ("student.grades_summary", "2"), ("menu", ""),
+            ("student.detailed_grades", "3"), ("menu", ""),
+            ("logout", "0"), ("quit", "n")
+        ]
+
+    def teacher_script(self, credentials, subjects):
+        return [
+            ("login.user_id", credentials[0]), ("login", credentials[1]),
+            ("menu", "2"), ("teacher.pending_enrollments", "1"), ("menu", ""), ("menu", "0"),
+            ("menu", "3"), ("teacher.roster", "1"), ("menu", ""), ("menu", "0"),
+            ("teacher.statistics", "4"), ("menu", ""),
+            ("logout", "0"), ("quit", "n")
+        ]
+
+    def admin_script(self, credentials, subjects):
+        return [
+            ("login.user_id", credentials[0]), ("login", credentials[1]),
+            ("menu", "2"), ("admin.students_page", "1"), ("admin.students_next_page", "n"), ("menu", "x"),
+            ("menu", "0"), ("menu", "3"), ("admin.courses_page", "1"), ("menu", "x"), ("menu", "0"),
+            ("logout", "0"), ("quit", "n")
+        ]
+
+    def scripts(self, data):
+        roles = self.random.choices(list(self.mix), weights=list(self.mix.values()), k=self.users)
+        builders = {'student': self.student_script, 'teacher': self.teacher_script, 'admin': self.admin_script}
+        used = {role: 0 for role in self.mix}
+        scripts = []
+        for role in roles:
+            accounts = data[role]
+            credentials = accounts[used[role] % len(accounts)]
+            used[role] += 1
+            scripts.append((role, builders[role](credentials, data['subjects'])))
+        return scripts
+
+    def run(self):
+        console.install()
+        scripts = self.scripts(self.sample())
+        recorder = LoadRecorder()
+        outcomes = {'completed': 0, 'failed': 0}
+        outcome_lock = threading.Lock()
+        start = threading.Barrier(len(scripts) + 1)
+
+        def virtual_user(steps):
+            session = ScriptedConsole(steps, recorder)
+            console.bind(session)
+            start.wait()
+            try:
+                run_session()
+                # A session that ends early (e.g. a failed login answering "Login again?") is out of step.
+                result = 'completed' if session.done else 'failed'
+            except EOFError:
+                # The script ran out before the portal expected, i.e. it fell out of step.
+                result = 'failed'
+            except Exception:
+                logger.exception("Virtual user session failed")
+                result = 'failed'
+            finally:
+                session.finish()
+                console.unbind()
+            with outcome_lock:
+                outcomes[result] += 1
+
+        db.stats.listeners.append(recorder.on_query)
+        admissions.listeners.append(recorder.on_admission_batch)
+        threads = [threading.Thread(target=virtual_user, args=(steps,), daemon=True) for _, steps in scripts]
+        try:
+            for thread in threads:
+                thread.start()
+            start.wait()
+            started = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            db.stats.listeners.remove(recorder.on_query)
+            admissions.listeners.remove(recorder.on_admission_batch)
+        return self.report(recorder, outcomes, elapsed, [role for role, _ in scripts])
+
+    def report(self, recorder, outcomes, elapsed, roles):
+        actions = []
+        for action, timings in sorted(recorder.latencies.items()):
+            timings = sorted(timings)
+            actions.append({
+                'action': action,
+                'count': len(timings),
+                'p50_ms': round(self.percentile(timings, 50), 3),
+                'p95_ms': round(self.percentile(timings, 95), 3),
+                'p99_ms': round(self.percentile(timings, 99), 3),
+                'max_ms': round(timings[-1], 3),
+                'queries_per_action': round(recorder.queries[action] / len(timings), 2)
+            })
+        total_actions = sum(a['count'] for a in actions)
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'users': {role: roles.count(role) for role in self.mix},
+            'sessions': outcomes,
+            'seconds': round(elapsed, 3),
+            'actions_per_second': round(total_actions / elapsed, 1) if elapsed else 0.0,
+            'sessions_per_second': round(len(roles) / elapsed, 1) if elapsed else 0.0,
+            'queries': round(sum(recorder.queries.values())),
+            'query_errors': recorder.errors,
+            'admissions': admissions.stats(),
+            'actions': actions
+        }
+
+    @staticmethod
+    def percentile(ordered, p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
\ No newline at end of file
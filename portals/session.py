@@ -0,0 +1,20 @@
+from colorama import Fore, Style
+from utils import Auth, Display
+from .admin import AdminPortal
+from .teacher import TeacherPortal
+from .student import StudentPortal
+
+PORTALS = {'admin': AdminPortal, 'teacher': TeacherPortal, 'student': StudentPortal}
+
+def run_session():
+    """One user's login → portal loop, on whatever console the current thread is bound to"""
+    while True:
+        Display.clear()
+        user = Auth.login()
+
+        if user:
+            portal = PORTALS[user['role']](user)
+            portal.show_menu()
+
+        if input(f"\n{Fore.YELLOW}Login again? (y/n): {Style.RESET_ALL}").lower() != 'y':
+            break
\ No newline at end of file
@@ -1,19 +1,20 @@
-from utils import Display
-from models.user import Student
-from models.enrollment import Enrollment
-from models.grade import Grade
+from utils import Display, Pager, files
 from models.subject import Subject
+from models.dashboard import StudentDashboard
+from models.exporter import GradeExporter
+from models.admission import admissions
 
 class StudentPortal:
     def __init__(self, user):
         self.user = user
         self.display = Display()
-        student_data = Student.get_by_user_id(user['user_id'])
-        if student_data:
-            self.student_id = student_data[0]
-            self.student_name = student_data[1]
-            self.course = student_data[2]
-            self.year_level = student_data[3]
+        # Profile, enrollments and grades in one query, reused by every menu option.
+        self.dashboard = StudentDashboard(user['user_id'])
+        if self.dashboard.load():
+            self.student_id = self.dashboard.student_id
+            self.student_name = self.dashboard.name
+            self.course = self.dashboard.course
+            self.year_level = self.dashboard.year_level
         else:
             self.student_id = None
 
@@ -29,7 +30,8 @@ class StudentPortal:
                 "View Enrolled Subjects",
                 "View Grades Summary",
                 "View Detailed Grade Report",
-                "Enroll in Subject"
+                "Enroll in Subject",
+                "Export Transcript (CSV/JSONL)"
             ])
             
             choice = input("\nEnter choice: ")
@@ -41,6 +43,8 @@ class StudentPortal:
                 self.view_detailed_grades()
             elif choice == '4':
                 self.enroll_subject()
+            elif choice == '5':
+                self.export_transcript()
             elif choice == '0':
                 break
 
@@ -52,19 +56,18 @@ class StudentPortal:
         print()
 
     def view_enrolled_subjects(self):
-        enrollments = Enrollment.get_by_student(self.student_id)
+        enrollments = self.dashboard.enrollments
         if enrollments:
-            self.display.table_header(["Subject Code", "Subject Name", "Status"])
-            for e in enrollments:
-                self.display.table_row([e[1], e[2], e[3]])
+            self.display.table(["Subject Code", "Subject Name", "Status"],
+                               [[e[1], e[2], e[3]] for e in enrollments])
         else:
             self.display.info("No enrolled subjects")
         input("\nPress Enter to continue...")
 
     def view_grades_summary(self):
-        grades = Grade.get_by_student(self.student_id)
+        grades = self.dashboard.grades
         if grades:
-            self.display.table_header(["Subject Code", "Subject Name", "Final Grade", "Remarks", "Type"])
+            rows = []
             for g in grades:
                 if g[11]:  # is_component_based
                     final_grade = f"{g[10]:.2f}" if g[10] is not None else "N/A"
@@ -74,13 +77,14 @@ class StudentPortal:
                     grade_type = "Legacy"
                 
                 remarks = g[3] or "N/A"
-                self.display.table_row([g[0], g[1], final_grade, remarks, grade_type])
+                rows.append([g[0], g[1], final_grade, remarks, grade_type])
+            self.display.table(["Subject Code", "Subject Name", "Final Grade", "Remarks", "Type"], rows)
         else:
             self.display.info("No grades available")
         input("\nPress Enter to continue...")
 
     def view_detailed_grades(self):
-        grades = Grade.get_by_student(self.student_id)
+        grades = self.dashboard.grades
         if not grades:
             self.display.info("No grades available")
             input("\nPress Enter to continue...")
@@ -157,18 +161,53 @@ class StudentPortal:
         input("\nPress Enter to continue...")
 
     def enroll_subject(self):
-        subjects = Subject.get_all()
-        if subjects:
-            self.display.table_header(["ID", "Code", "Name", "Description", "Teacher", "Course"])
-            for s in subjects:
-                self.display.table_row([s[0], s[1], s[2], s[3] or "N/A", s[4] or "N/A", s[5] or "N/A"])
-            
-            subject_id = input("\nEnter Subject ID to enroll: ")
-            result = Enrollment.create(self.student_id, subject_id)
-            if result:
+        subject_id = Pager(Subject.get_page, self.render_subjects).run(
+            "\nEnter Subject ID to enroll (n = next page, p = previous page): ")
+        if subject_id is not None:
+            try:
+                outcome = admissions.enroll(self.student_id, subject_id)
+            except ValueError:
+                outcome = 'not_found'
+            if outcome == 'pending':
+                self.dashboard.invalidate()
                 self.display.success("Enrollment request submitted!")
+            elif outcome == 'full':
+                self.display.error("Subject is full")
+            elif outcome == 'duplicate':
+                self.display.error("You have already requested this subject")
+            elif outcome == 'not_found':
+                self.display.error("No subject with that ID")
             else:
-                self.display.error("Failed to submit enrollment (may already be enrolled)")
+                self.display.error("Failed to submit enrollment")
         else:
             self.display.info("No subjects available")
+        input("\nPress Enter to continue...")
+
+    def render_subjects(self, subjects):
+        self.display.table(["ID", "Code", "Name", "Description", "Teacher", "Course", "Capacity"],
+                           [[s[0], s[1], s[2], s[3] or "N/A", s[4] or "N/A", s[5] or "N/A",
+                             s[6] if s[6] is not None else "Open"] for s in subjects])
+
+    def export_transcript(self):
+        fmt = input("Format (csv/jsonl) [csv]: ").strip().lower() or 'csv'
+        if fmt not in GradeExporter.FORMATS:
+            self.display.error("Unknown format")
+            input("\nPress Enter to continue...")
+            return
+        default_path = f"transcript_{self.user['user_id']}.{fmt}"
+        path = input(f"Output file [{default_path}]: ").strip() or default_path
+        path = files.resolve_or_report(self.display, path)
+        if path is None:
+            input("\nPress Enter to continue...")
+            return
+
+        try:
+            count = GradeExporter(fmt).transcript(self.student_id, path)
+        except OSError as error:
+            self.display.error(f"Export failed: {error}")
+            count = None
+        if count is None:
+            self.display.error("Failed to export transcript")
+        else:
+            self.display.success(f"{count} subjects written to {path}")
         input("\nPress Enter to continue...")
\ No newline at end of file
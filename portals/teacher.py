@@ -1,9 +1,12 @@
-from utils import Display
+from utils import Display, files
 from models.user import Teacher
 from models.subject import Subject
 from models.course import Course
 from models.enrollment import Enrollment
 from models.grade import Grade
+from models.analytics import GradeAnalytics
+from models.importer import GradeSheetImporter
+from models.exporter import GradeExporter
 
 class TeacherPortal:
     def __init__(self, user):
@@ -19,7 +22,8 @@ class TeacherPortal:
                 "Manage Subjects",
                 "Manage Enrollments",
                 "Manage Grades",
-                "View Grade Statistics"
+                "View Grade Statistics",
+                "View Grade Distribution"
             ])
             
             choice = input("\nEnter choice: ")
@@ -31,6 +35,8 @@ class TeacherPortal:
                 self.manage_grades()
             elif choice == '4':
                 self.view_grade_statistics()
+            elif choice == '5':
+                self.view_grade_distribution()
             elif choice == '0':
                 break
 
@@ -59,9 +65,9 @@ class TeacherPortal:
     def view_subjects(self):
         subjects = Subject.get_by_teacher(self.teacher_id)
         if subjects:
-            self.display.table_header(["ID", "Code", "Name", "Description", "Course"])
-            for s in subjects:
-                self.display.table_row([s[0], s[1], s[2], s[3] or "N/A", s[4] or "N/A"])
+            self.display.table(["ID", "Code", "Name", "Description", "Course", "Capacity"],
+                               [[s[0], s[1], s[2], s[3] or "N/A", s[4] or "N/A",
+                                 s[5] if s[5] is not None else "Open"] for s in subjects])
         else:
             self.display.info("No subjects found")
         input("\nPress Enter to continue...")
@@ -72,8 +78,9 @@ class TeacherPortal:
         name = input("Subject Name: ")
         description = input("Description: ")
         course_id = input("Course ID: ")
+        capacity = input("Capacity (blank for no limit): ").strip() or None
         
-        result = Subject.create(code, name, description, self.teacher_id, course_id)
+        result = Subject.create(code, name, description, self.teacher_id, course_id, capacity)
         if result:
             self.display.success("Subject added successfully!")
         else:
@@ -87,8 +94,9 @@ class TeacherPortal:
         name = input("New Name: ")
         description = input("New Description: ")
         course_id = input("New Course ID: ")
+        capacity = input("New Capacity (blank for no limit): ").strip() or None
         
-        result = Subject.update(subject_id, code, name, description, course_id)
+        result = Subject.update(subject_id, code, name, description, course_id, capacity)
         if result is not None:
             self.display.success("Subject updated successfully!")
         else:
@@ -109,16 +117,16 @@ class TeacherPortal:
     def view_courses(self):
         courses = Course.get_all()
         if courses:
-            self.display.table_header(["ID", "Name", "Description"])
-            for c in courses:
-                self.display.table_row([c[0], c[1], c[2] or "N/A"])
+            self.display.table(["ID", "Name", "Description"],
+                               [[c[0], c[1], c[2] or "N/A"] for c in courses])
 
     def manage_enrollments(self):
         while True:
             self.display.header("ENROLLMENT MANAGEMENT")
             self.display.menu([
                 "View Pending Enrollments",
-                "Approve/Deny Enrollments"
+                "Approve/Deny Enrollments",
+                "Bulk Approve/Deny Enrollments"
             ])
             
             choice = input("\nEnter choice: ")
@@ -126,15 +134,16 @@ class TeacherPortal:
                 self.view_pending_enrollments()
             elif choice == '2':
                 self.approve_deny_enrollments()
+            elif choice == '3':
+                self.bulk_approve_deny_enrollments()
             elif choice == '0':
                 break
 
     def view_pending_enrollments(self):
         enrollments = Enrollment.get_pending_by_teacher(self.teacher_id)
         if enrollments:
-            self.display.table_header(["ID", "Student", "Subject Code", "Subject Name", "Date"])
-            for e in enrollments:
-                self.display.table_row([e[0], e[1], e[2], e[3], str(e[4])[:10]])
+            self.display.table(["ID", "Student", "Subject Code", "Subject Name", "Date"],
+                               [[e[0], e[1], e[2], e[3], str(e[4])[:10]] for e in enrollments])
         else:
             self.display.info("No pending enrollments")
         input("\nPress Enter to continue...")
@@ -146,7 +155,9 @@ class TeacherPortal:
         
         if status in ['approved', 'denied']:
             result = Enrollment.update_status(enrollment_id, status)
-            if result is not None:
+            if result == 'full':
+                self.display.error("Subject is full")
+            elif result is not None:
                 self.display.success(f"Enrollment {status} successfully!")
             else:
                 self.display.error("Failed to update enrollment")
@@ -154,6 +165,49 @@ class TeacherPortal:
             self.display.error("Invalid status")
         input("\nPress Enter to continue...")
 
+    def bulk_approve_deny_enrollments(self):
+        self.view_pending_enrollments()
+        self.display.menu([
+            "All pending for a subject",
+            "By enrollment IDs",
+            "By filter (subject, student course, enrolled before)"
+        ])
+        choice = input("\nEnter choice: ")
+        filters = {}
+        if choice == '1':
+            filters['subject_id'] = input("Subject ID: ").strip()
+            if not filters['subject_id']:
+                self.display.info("Operation cancelled.")
+                return
+        elif choice == '2':
+            ids = [i.strip() for i in input("Enrollment IDs (comma-separated): ").split(',') if i.strip()]
+            if not ids:
+                self.display.info("Operation cancelled.")
+                return
+            filters['enrollment_ids'] = ids
+        elif choice == '3':
+            filters['subject_id'] = input("Subject ID (blank for any): ").strip() or None
+            filters['course_id'] = input("Student Course ID (blank for any): ").strip() or None
+            filters['enrolled_before'] = input("Enrolled before (YYYY-MM-DD, blank for any): ").strip() or None
+        else:
+            return
+
+        status = input("Enter status (approved/denied): ").lower()
+        if status not in ['approved', 'denied']:
+            self.display.error("Invalid status")
+            input("\nPress Enter to continue...")
+            return
+
+        result = Enrollment.update_status_bulk(self.teacher_id, status, **filters)
+        if result is None:
+            self.display.error("Failed to update enrollments")
+        else:
+            self.display.success(f"{result} enrollment(s) {status}")
+            if 'enrollment_ids' in filters and result < len(filters['enrollment_ids']):
+                skipped = len(filters['enrollment_ids']) - result
+                self.display.info(f"{skipped} ID(s) skipped (not pending or not in your subjects)")
+        input("\nPress Enter to continue...")
+
     def manage_grades(self):
         while True:
             self.display.header("GRADE MANAGEMENT")
@@ -161,7 +215,9 @@ class TeacherPortal:
                 "View Students with Grades",
                 "Enter/Update Component Grades",
                 "Enter/Update Simple Grade (Legacy)",
-                "View Detailed Grade Report"
+                "View Detailed Grade Report",
+                "Import Grade Sheet (CSV/TSV)",
+                "Export Grade Sheet (CSV/JSONL)"
             ])
             
             choice = input("\nEnter choice: ")
@@ -173,15 +229,19 @@ class TeacherPortal:
                 self.enter_simple_grades()
             elif choice == '4':
                 self.view_detailed_grades()
+            elif choice == '5':
+                self.import_grade_sheet()
+            elif choice == '6':
+                self.export_grade_sheet()
             elif choice == '0':
                 break
 
     def view_enrolled_students(self):
-        students = Enrollment.get_approved_by_teacher(self.teacher_id)
+        students = Enrollment.get_roster_by_teacher(self.teacher_id)
         if students:
-            self.display.table_header(["Enrollment ID", "Student", "Subject Code", "Subject Name", "Final Grade", "Type"])
+            rows = []
             for s in students:
-                grade_data = Grade.get_detailed_by_enrollment(s[0])
+                grade_data = s[4]
                 if grade_data:
                     if grade_data['is_component_based']:
                         grade_display = f"{grade_data['final_grade']:.2f}" if grade_data['final_grade'] is not None else "N/A"
@@ -193,7 +253,8 @@ class TeacherPortal:
                     grade_display = "N/A"
                     grade_type = "None"
                 
-                self.display.table_row([s[0], s[1], s[2], s[3], grade_display, grade_type])
+                rows.append([s[0], s[1], s[2], s[3], grade_display, grade_type])
+            self.display.table(["Enrollment ID", "Student", "Subject Code", "Subject Name", "Final Grade", "Type"], rows)
         else:
             self.display.info("No enrolled students")
         input("\nPress Enter to continue...")
@@ -291,6 +352,83 @@ class TeacherPortal:
         
         input("\nPress Enter to continue...")
 
+    def import_grade_sheet(self):
+        self.view_subjects()
+        subject_id = input("Enter Subject ID: ")
+        if not subject_id:
+            self.display.info("Operation cancelled.")
+            return
+        self.display.info("Columns: enrollment_id or user_id, activity, quiz, exam "
+                          "[, activity_weight, quiz_weight, exam_weight]. Blank cells keep the stored value.")
+        path = input("Grade sheet path: ")
+        if not path:
+            self.display.info("Operation cancelled.")
+            return
+        path = files.resolve_or_report(self.display, path)
+        if path is None:
+            input("\nPress Enter to continue...")
+            return
+
+        importer = GradeSheetImporter(self.teacher_id, subject_id)
+        try:
+            summary = importer.load(path)
+        except (OSError, ValueError) as error:
+            self.display.error(f"Import failed: {error}")
+            input("\nPress Enter to continue...")
+            return
+
+        if importer.changes:
+            self.display.table(["Enrollment ID", "Student", "Old Final", "New Final", "Remarks"],
+                               [[e, name, f"{old:.2f}" if old is not None else "N/A",
+                                 f"{new:.2f}" if new is not None else "N/A", remarks or ""]
+                                for e, name, old, new, remarks, is_new in importer.changes])
+        for line, reason, row in importer.rejects:
+            self.display.error(f"Line {line}: {reason}")
+        print(f"\nNew: {summary['new']}  Changed: {summary['changed']}  "
+              f"Unchanged: {summary['unchanged']}  Rejected: {summary['rejected']}")
+
+        if not importer.changes:
+            self.display.info("Nothing to save")
+        elif input("\nSave these grades? (y/n): ").lower() == 'y':
+            written = importer.apply()
+            if written is None:
+                self.display.error("Failed to save grades; nothing was changed")
+            else:
+                self.display.success(f"{written} grades saved")
+        else:
+            self.display.info("Grade import cancelled")
+        input("\nPress Enter to continue...")
+
+    def export_grade_sheet(self):
+        self.view_subjects()
+        subject_id = input("Enter Subject ID: ")
+        if not subject_id:
+            self.display.info("Operation cancelled.")
+            return
+        fmt = input("Format (csv/jsonl) [csv]: ").strip().lower() or 'csv'
+        if fmt not in GradeExporter.FORMATS:
+            self.display.error("Unknown format")
+            input("\nPress Enter to continue...")
+            return
+        path = input(f"Output file [subject_{subject_id}.{fmt}]: ").strip() or f"subject_{subject_id}.{fmt}"
+        path = files.resolve_or_report(self.display, path)
+        if path is None:
+            input("\nPress Enter to continue...")
+            return
+
+        try:
+            count = GradeExporter(fmt).subject_sheet(subject_id, path, teacher_id=self.teacher_id)
+        except OSError as error:
+            self.display.error(f"Export failed: {error}")
+            count = None
+        if count is None:
+            self.display.error("Failed to export grade sheet")
+        elif count == 0:
+            self.display.info("No approved enrollments for that subject")
+        else:
+            self.display.success(f"{count} rows written to {path}")
+        input("\nPress Enter to continue...")
+
     def enter_simple_grades(self):
         self.view_enrolled_students()
         enrollment_id = input("Enter Enrollment ID: ")
@@ -312,7 +450,7 @@ class TeacherPortal:
         input("\nPress Enter to continue...")
 
     def view_detailed_grades(self):
-        students = Enrollment.get_approved_by_teacher(self.teacher_id)
+        students = Enrollment.get_roster_by_teacher(self.teacher_id)
         if not students:
             self.display.info("No enrolled students")
             input("\nPress Enter to continue...")
@@ -323,7 +461,7 @@ class TeacherPortal:
         print("="*80)
         
         for s in students:
-            grade_data = Grade.get_detailed_by_enrollment(s[0])
+            grade_data = s[4]
             print(f"\nStudent: {s[1]} | Subject: {s[2]} - {s[3]}")
             print("-" * 60)
             
@@ -345,7 +483,7 @@ class TeacherPortal:
         input("\nPress Enter to continue...")
 
     def view_grade_statistics(self):
-        stats = Grade.get_grade_statistics()
+        stats = Grade.get_grade_statistics(teacher_id=self.teacher_id)
         if stats:
             self.display.header("GRADE STATISTICS")
             print(f"Total Grades: {stats[0]}")
@@ -356,7 +494,49 @@ class TeacherPortal:
             if stats[0] > 0:
                 pass_rate = (stats[2] / stats[0]) * 100 if stats[2] else 0
                 print(f"Pass Rate: {pass_rate:.1f}%")
+
+                subjects = Grade.get_subject_statistics(self.teacher_id)
+                self.display.table(["Subject Code", "Subject Name", "Graded", "Average", "Passed", "Failed"],
+                                   [[s[0], s[1], s[2], f"{s[3]:.2f}" if s[3] is not None else "N/A", s[4], s[5]]
+                                    for s in subjects])
         else:
             self.display.info("No grade statistics available")
         
-        input("\nPress Enter to continue...")
\ No newline at end of file
+        input("\nPress Enter to continue...")
+
+    def view_grade_distribution(self):
+        distributions = GradeAnalytics.build(teacher_id=self.teacher_id)
+        if not distributions:
+            self.display.info("No grades recorded yet")
+            input("\nPress Enter to continue...")
+            return
+
+        self.display.header("GRADE DISTRIBUTION")
+        overall = GradeAnalytics.by_teacher(distributions, self.teacher_id)
+        overall.code, overall.name = "ALL", "All my subjects"
+        for distribution in sorted(distributions.values(), key=lambda d: str(d.code)) + [overall]:
+            self.print_distribution(distribution)
+        input("\nPress Enter to continue...")
+
+    def print_distribution(self, distribution):
+        final = distribution.final
+        print(f"\nSubject: {distribution.code} - {distribution.name}")
+        print("-" * 60)
+        if not final.count:
+            print("No grades recorded yet")
+            return
+        print(f"Graded: {final.count} | Passed: {distribution.passed} | Failed: {distribution.failed}")
+        print(f"Mean: {final.mean:.2f} | Std Dev: {final.stddev:.2f} | Min: {final.minimum:.2f} | Max: {final.maximum:.2f}")
+        print(f"P10: {final.percentile(10):.2f} | P50: {final.percentile(50):.2f} | P90: {final.percentile(90):.2f}")
+
+        components = [("Activity", distribution.activity), ("Quiz", distribution.quiz), ("Exam", distribution.exam)]
+        rows = [[label, sketch.count, f"{sketch.mean:.2f}", f"{sketch.stddev:.2f}", f"{sketch.percentile(50):.2f}"]
+                for label, sketch in components if sketch.count]
+        if rows:
+            self.display.table(["Component", "Count", "Mean", "Std Dev", "Median"], rows)
+
+        bins = final.histogram()
+        widest = max(count for _, _, count in bins)
+        for low, high, count in bins:
+            bar = "#" * (round(count / widest * 40) if widest else 0)
+            print(f"{low:>3}-{high:<3} | {bar} {count}")
\ No newline at end of file
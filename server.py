@@ -0,0 +1,123 @@
+import logging
+import os
+import socket
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from colorama import Fore, Style
+from portals import run_session
+from utils import console
+
+logger = logging.getLogger('lms.server')
+
+class PortalServer:
+    """
+    Host many portal sessions in one long-lived process. Each client (telnet or netcat over TCP,
+    or a Unix socket) runs run_session() on a pool thread whose print()/input() are routed to its
+    socket, and every session shares the pooled db and the model caches. Connections beyond
+    max_sessions wait in the executor queue until a session ends.
+    """
+    def __init__(self, address, max_sessions=32, idle_timeout=900):
+        self.address = address
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self._lock = threading.Lock()
+        self._listener = None
+        self._executor = None
+        self._socket = None
+
+    @staticmethod
+    def parse_address(value):
+        """'unix:/path/to.sock' → path; 'host:port' or 'port' → (host, port), host defaulting to localhost"""
+        if value.startswith('unix:'):
+            return value[5:]
+        host, _, port = value.rpartition(':')
+        return (host or '127.0.0.1', int(port))
+
+    def describe(self):
+        if isinstance(self.address, str):
+            return f"unix:{self.address}"
+        return f"{self.address[0]}:{self.address[1]}"
+
+    def _listen(self):
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                # Only clear a socket left behind by an earlier server, never a regular file.
+                if not stat.S_ISSOCK(os.stat(self.address).st_mode):
+                    raise FileExistsError(f"{self.address} exists and is not a socket")
+                os.remove(self.address)
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                listener.bind(self.address)
+                listener.listen()
+            except OSError:
+                listener.close()
+                raise
+            # Remember which file is ours so shutdown never removes one that replaced it.
+            self._socket = (self.address, os.stat(self.address).st_ino)
+            return listener
+        return socket.create_server(self.address)
+
+    def serve_forever(self):
+        console.install()
+        self._listener = self._listen()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_sessions, thread_name_prefix='session')
+        try:
+            while True:
+                try:
+                    sock, peer = self._listener.accept()
+                except OSError:
+                    break
+                with self._lock:
+                    busy = len(self.sessions) >= self.max_sessions
+                    self.sessions[sock] = peer
+                if busy:
+                    try:
+                        sock.sendall(b"All sessions are busy; you will be connected when one ends.\r\n")
+                    except OSError:
+                        pass
+                self._executor.submit(self._handle, sock, peer)
+        finally:
+            self.shutdown()
+
+    def _handle(self, sock, peer):
+        sock.settimeout(self.idle_timeout)
+        stream = console.SocketConsole(sock)
+        console.bind(stream)
+        try:
+            run_session()
+            print(f"\n{Fore.YELLOW}Goodbye!{Style.RESET_ALL}")
+            stream.flush()
+        except (EOFError, OSError):
+            # Client hung up, idled past the timeout, or the server is shutting down.
+            pass
+        except Exception:
+            logger.exception("Session from %s failed", peer)
+        finally:
+            console.unbind()
+            stream.close()
+            with self._lock:
+                self.sessions.pop(sock, None)
+            sock.close()
+
+    def shutdown(self):
+        """Stop accepting, disconnect every open session and wait for the workers to finish"""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            if self._socket is not None:
+                (path, inode), self._socket = self._socket, None
+                if os.path.exists(path) and os.stat(path).st_ino == inode and stat.S_ISSOCK(os.stat(path).st_mode):
+                    os.remove(path)
+        with self._lock:
+            open_sessions = list(self.sessions)
+        for sock in open_sessions:
+            try:
+                # Wakes the session's blocked readline() with EOF.
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
\ No newline at end of file
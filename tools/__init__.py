@@ -0,0 +1,3 @@
+from .seed import DataGenerator
+from .benchmark import Benchmark
+from .advisor import IndexAdvisor
\ No newline at end of file
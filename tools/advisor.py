@@ -0,0 +1,151 @@
+import os
+import re
+import sys
+import tempfile
+from database import Error, db
+from database.instrumentation import caller, fingerprint
+from .benchmark import Benchmark
+from models.cache import caches
+from models.enrollment import Enrollment
+from models.subject import Subject
+from models.grade import Grade
+from models.exporter import GradeExporter
+
+class _Rollback(Exception):
+    pass
+
+class IndexAdvisor:
+    """
+    Runs the model methods once against a seeded database, records every statement they send
+    (first parameters per fingerprint) and flags plans that scan whole tables or sort without
+    an index. Writes happen inside one transaction that is rolled back at the end. Tables with
+    fewer than min_rows rows are ignored, since scanning them is cheaper than an index lookup.
+    """
+    SKIP = re.compile(r"^\s*(INSERT|CREATE|DROP|ALTER)\b", re.I)
+    TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN|UPDATE)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?", re.I)
+    KEYWORDS = {'where', 'on', 'join', 'left', 'right', 'inner', 'outer', 'cross', 'group', 'order', 'limit', 'set', 'using'}
+
+    def __init__(self, min_rows=1000):
+        self.min_rows = min_rows
+        self.captured = {}
+        self.table_rows = {}
+
+    def cases(self, keys, export_path):
+        """The benchmark cases plus the write and export paths the benchmark leaves out"""
+        exporter = GradeExporter()
+        return Benchmark().cases(keys) + [
+            ("Enrollment.request", lambda: Enrollment.request(keys['middle_student_id'], keys['subject_id'])),
+            ("Enrollment.existing_pairs", lambda: Enrollment.existing_pairs([(keys['student_id'], keys['subject_id'])])),
+            ("Enrollment.get_grade_sheet", lambda: Enrollment.get_grade_sheet(keys['teacher_id'], keys['subject_id'])),
+            ("Enrollment.update_status_bulk", lambda: Enrollment.update_status_bulk(keys['teacher_id'], 'approved',
+                                                                                    subject_id=keys['subject_id'])),
+            ("Subject.reserve_seats", lambda: Subject.reserve_seats(keys['subject_id'])),
+            ("Subject.recount_seats(teacher)", lambda: Subject.recount_seats(teacher_id=keys['teacher_id'])),
+            ("Grade.rebuild_statistics", Grade.rebuild_statistics),
+            ("GradeExporter.subject_sheet", lambda: exporter.subject_sheet(keys['subject_id'], export_path)),
+            ("GradeExporter.transcript", lambda: exporter.transcript(keys['student_id'], export_path)),
+        ]
+
+    def capture(self):
+        """Run every case and keep the first (query, params, case, origin) seen for each statement"""
+        keys = Benchmark().sample()
+        export_path = os.path.join(tempfile.gettempdir(), f"lms_advise_{os.getpid()}.csv")
+        self.captured = {}
+        case_name = [None]
+
+        def tracer(query, params):
+            key = fingerprint(query)
+            if key not in self.captured and not self.SKIP.match(query):
+                # Start from db._trace so the origin is the model method, not this tracer.
+                self.captured[key] = (query, params, case_name[0], caller(sys._getframe(1)))
+
+        for cache in caches:
+            cache.invalidate()
+        db.tracers.append(tracer)
+        try:
+            with db.transaction():
+                for name, call in self.cases(keys, export_path):
+                    case_name[0] = name
+                    try:
+                        call()
+                    except Error:
+                        pass
+                raise _Rollback()
+        except _Rollback:
+            pass
+        finally:
+            db.tracers.remove(tracer)
+            if os.path.exists(export_path):
+                os.remove(export_path)
+        return self.captured
+
+    def run(self):
+        """Capture the statements and explain each one; returns a report dict"""
+        self.capture()
+        statements = []
+        for key, (query, params, case, origin) in self.captured.items():
+            try:
+                plan = db.explain(query, params)
+            except Error as error:
+                statements.append({'statement': key, 'case': case, 'origin': origin,
+                                   'findings': [f"could not explain: {error}"], 'plan': []})
+                continue
+            statements.append({'statement': key, 'case': case, 'origin': origin,
+                               'findings': self.findings(query, plan), 'plan': plan})
+        flagged = [s for s in statements if s['findings']]
+        return {'backend': db.backend.name, 'min_rows': self.min_rows, 'statements': len(statements),
+                'flagged': len(flagged), 'results': flagged + [s for s in statements if not s['findings']]}
+
+    def findings(self, query, plan):
+        if db.backend.name == 'sqlite':
+            return self._sqlite_findings(query, plan)
+        return self._mysql_findings(plan)
+
+    def _mysql_findings(self, plan):
+        findings = []
+        for row in plan:
+            table = row.get('table')
+            rows = row.get('rows') or 0
+            extra = row.get('Extra') or ''
+            if rows < self.min_rows:
+                continue
+            if row.get('type') == 'ALL':
+                findings.append(f"full table scan of {table} (~{rows} rows)")
+            elif row.get('type') == 'index':
+                findings.append(f"full index scan of {table} (~{rows} rows)")
+            if 'Using filesort' in extra:
+                findings.append(f"filesort on {table} (~{rows} rows)")
+            if 'Using temporary' in extra:
+                findings.append(f"temporary table for {table} (~{rows} rows)")
+        return findings
+
+    def _sqlite_findings(self, query, plan):
+        # SQLite plans give no row estimates, so judge by the size of the tables involved.
+        aliases = {}
+        for table, alias in self.TABLE_REFERENCE.findall(query):
+            aliases[table.lower()] = table
+            if alias and alias.lower() not in self.KEYWORDS:
+                aliases[alias.lower()] = table
+        sizes = [self._rows(table) for table in set(aliases.values())]
+        large = any(size >= self.min_rows for size in sizes)
+        findings = []
+        for row in plan:
+            detail = row['detail']
+            match = re.match(r"SCAN (\w+)(.*)", detail)
+            if match and match.group(1).lower() in aliases:
+                table = aliases[match.group(1).lower()]
+                rows = self._rows(table)
+                if rows >= self.min_rows:
+                    kind = "full index scan" if "INDEX" in match.group(2) else "full table scan"
+                    findings.append(f"{kind} of {table} ({rows} rows)")
+            elif large and detail.startswith("USE TEMP B-TREE FOR ORDER BY"):
+                findings.append("filesort (temp b-tree for ORDER BY)")
+            elif large and detail.startswith("USE TEMP B-TREE"):
+                findings.append(f"temporary table ({detail[len('USE TEMP B-TREE '):].lower()})")
+        return findings
+
+    def _rows(self, table):
+        if table not in self.table_rows:
+            row = db.fetch_one(f"SELECT COUNT(*) FROM {table}")
+            self.table_rows[table] = row[0] if row else 0
+        return self.table_rows[table]
\ No newline at end of file
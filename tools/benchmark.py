@@ -0,0 +1,130 @@
+import json
+import platform
+import statistics
+import time
+from database import db
+from models.user import User, Admin, Teacher, Student
+from models.course import Course
+from models.subject import Subject
+from models.enrollment import Enrollment
+from models.grade import Grade
+from models.analytics import GradeAnalytics
+from models.dashboard import StudentDashboard
+from models.cache import caches
+
+class Benchmark:
+    """
+    Times the model methods against whatever database `db` is connected to and records the
+    results as JSON. Caches are cleared before every call so the numbers reflect database work.
+    """
+    def __init__(self, repeat=5):
+        self.repeat = repeat
+
+    def sample(self):
+        """Pick representative keys from the seeded data: the busiest teacher, student and subject"""
+        teacher = db.fetch_one("""SELECT s.teacher_id, t.user_id FROM subjects s JOIN teachers t ON s.teacher_id = t.id
+                                  GROUP BY s.teacher_id, t.user_id ORDER BY COUNT(*) DESC LIMIT 1""")
+        student = db.fetch_one("""SELECT e.student_id, st.user_id, st.password FROM enrollments e
+                                  JOIN students st ON e.student_id = st.id
+                                  WHERE e.status = 'approved' ORDER BY e.id LIMIT 1""")
+        grade = db.fetch_one("""SELECT g.enrollment_id, e.subject_id, g.activity_score, g.quiz_score, g.exam_score
+                                FROM grades g JOIN enrollments e ON g.enrollment_id = e.id
+                                WHERE g.is_component_based = 1 ORDER BY g.id LIMIT 1""")
+        if not teacher or not student or not grade:
+            raise RuntimeError("Benchmark needs seeded data; run 'python manage.py seed' first")
+        middle = db.fetch_one("SELECT id FROM students ORDER BY id LIMIT 1 OFFSET %s",
+                              (db.fetch_one("SELECT COUNT(*) FROM students")[0] // 2,))
+        return {
+            'teacher_id': teacher[0], 'teacher_user_id': teacher[1],
+            'student_id': student[0], 'student_user_id': student[1], 'student_password': student[2],
+            'enrollment_id': grade[0], 'subject_id': grade[1], 'scores': [float(v) for v in grade[2:]],
+            'middle_student_id': middle[0]
+        }
+
+    def cases(self, keys):
+        a, q, e = keys['scores']
+        return [
+            ("User.authenticate", lambda: User.authenticate(keys['student_user_id'], keys['student_password'])),
+            ("User.id_exists", lambda: User.id_exists(keys['student_user_id'])),
+            ("Admin.get_teachers", Admin.get_teachers),
+            ("Admin.get_students", Admin.get_students),
+            ("Admin.iter_students", lambda: sum(1 for _ in Admin.iter_students())),
+            ("Admin.get_students_page", lambda: Admin.get_students_page(after=keys['middle_student_id'])),
+            ("Teacher.get_by_user_id", lambda: Teacher.get_by_user_id(keys['teacher_user_id'])),
+            ("Student.get_by_user_id", lambda: Student.get_by_user_id(keys['student_user_id'])),
+            ("StudentDashboard.load", lambda: StudentDashboard(keys['student_user_id']).load()),
+            ("Course.get_all", Course.get_all),
+            ("Course.get_page", Course.get_page),
+            ("Subject.get_all", Subject.get_all),
+            ("Subject.get_page", Subject.get_page),
+            ("Subject.get_by_teacher", lambda: Subject.get_by_teacher(keys['teacher_id'])),
+            ("Subject.get_enrolled_by_student", lambda: Subject.get_enrolled_by_student(keys['student_id'])),
+            ("Enrollment.get_pending_by_teacher", lambda: Enrollment.get_pending_by_teacher(keys['teacher_id'])),
+            ("Enrollment.get_approved_by_teacher", lambda: Enrollment.get_approved_by_teacher(keys['teacher_id'])),
+            ("Enrollment.get_roster_by_teacher", lambda: Enrollment.get_roster_by_teacher(keys['teacher_id'])),
+            ("Enrollment.get_by_student", lambda: Enrollment.get_by_student(keys['student_id'])),
+            ("Grade.get_by_student", lambda: Grade.get_by_student(keys['student_id'])),
+            ("Grade.get_detailed_by_enrollment", lambda: Grade.get_detailed_by_enrollment(keys['enrollment_id'])),
+            ("Grade.create_or_update", lambda: Grade.create_or_update(keys['enrollment_id'], activity_score=a, quiz_score=q,
+                                                                      exam_score=e, is_component_based=True)),
+            ("Grade.regrade(subject)", lambda: Grade.regrade(subject_id=keys['subject_id'])),
+            ("Grade.get_grade_statistics", Grade.get_grade_statistics),
+            ("Grade.get_grade_statistics(teacher)", lambda: Grade.get_grade_statistics(teacher_id=keys['teacher_id'])),
+            ("Grade.get_subject_statistics", lambda: Grade.get_subject_statistics(keys['teacher_id'])),
+            ("GradeAnalytics.build(teacher)", lambda: GradeAnalytics.build(teacher_id=keys['teacher_id'])),
+        ]
+
+    def run(self, progress=None):
+        keys = self.sample()
+        results = []
+        for name, call in self.cases(keys):
+            timings = []
+            queries = 0
+            for _ in range(self.repeat + 1):
+                for cache in caches:
+                    cache.invalidate()
+                before = sum(s.calls for s in db.stats.snapshot())
+                started = time.perf_counter()
+                call()
+                timings.append((time.perf_counter() - started) * 1000)
+                queries = sum(s.calls for s in db.stats.snapshot()) - before
+            timings = sorted(timings[1:])  # the first call only warms up
+            result = {
+                'name': name,
+                'repeat': self.repeat,
+                'queries_per_call': queries,
+                'min_ms': round(timings[0], 3),
+                'median_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+                'max_ms': round(timings[-1], 3)
+            }
+            results.append(result)
+            if progress:
+                progress(result)
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'table_rows': {table: db.fetch_one(f"SELECT COUNT(*) FROM {table}")[0]
+                           for table in ('courses', 'teachers', 'subjects', 'students', 'enrollments', 'grades')},
+            'results': results
+        }
+
+    @staticmethod
+    def save(report, path):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    @staticmethod
+    def compare(report, baseline_path):
+        """Lines showing each case's median against a previous run's JSON"""
+        with open(baseline_path) as f:
+            baseline = {r['name']: r for r in json.load(f)['results']}
+        lines = []
+        for result in report['results']:
+            previous = baseline.get(result['name'])
+            if previous and previous['median_ms']:
+                change = (result['median_ms'] - previous['median_ms']) / previous['median_ms'] * 100
+                lines.append(f"{result['name']:<40} {previous['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms ({change:+.1f}%)")
+            else:
+                lines.append(f"{result['name']:<40} {'new':>10} -> {result['median_ms']:>10.3f} ms")
+        return lines
\ No newline at end of file
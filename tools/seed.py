@@ -0,0 +1,109 @@
+import random
+import time
+from database import db
+from models.user import UserIdAllocator
+from models.grade import Grade
+from models.subject import Subject
+from models.grading import GradeEngine
+from models.cache import caches
+
+class DataGenerator:
+    """
+    Seeded synthetic data for the existing schema. Rows are appended after the current
+    MAX(id) of each table and written with execute_many in batches, so it can fill an
+    empty database or top up an existing one.
+    """
+    def __init__(self, seed=42, courses=20, teachers=200, subjects=2000, students=100000, enrollments=1000000,
+                 graded_ratio=0.8, batch_size=5000):
+        self.random = random.Random(seed)
+        self.courses = courses
+        self.teachers = teachers
+        self.subjects = subjects
+        self.students = students
+        self.enrollments = enrollments
+        self.graded_ratio = graded_ratio
+        self.batch_size = batch_size
+        self.user_ids = UserIdAllocator(block_size=batch_size)
+        self.counts = {}
+
+    def run(self):
+        started = time.perf_counter()
+        course_ids = self._insert("courses", ["name", "description"], self.courses,
+                                  lambda n, i: (f"Seed Course {i}", f"Synthetic course #{i}"))
+        teacher_ids = self._insert("teachers", ["user_id", "name", "email", "password", "position"], self.teachers,
+                                   lambda n, i: self._person(i, "teacher") + (self.random.choice(["Instructor", "Professor", "Lecturer"]),))
+        subject_ids = self._insert("subjects", ["code", "name", "description", "teacher_id", "course_id"], self.subjects,
+                                   lambda n, i: (f"SD{i}", f"Seed Subject {i}", "Synthetic subject",
+                                                 self.random.choice(teacher_ids), self.random.choice(course_ids)))
+        student_ids = self._insert("students", ["user_id", "name", "email", "password", "course_id", "year_level"], self.students,
+                                   lambda n, i: self._person(i, "student") + (self.random.choice(course_ids), self.random.randint(1, 4)))
+        self._insert_enrollments(student_ids, subject_ids)
+        Subject.recount_seats()
+        for cache in caches:
+            cache.invalidate()
+        self.counts['seconds'] = round(time.perf_counter() - started, 2)
+        return self.counts
+
+    def _person(self, i, role):
+        user_id = self.user_ids.next_id()
+        if user_id is None:
+            raise RuntimeError("6-digit user ID space exhausted")
+        return (user_id, f"Seed {role.title()} {i}", f"{role}{user_id}@seed.lms", "password")
+
+    def _next_id(self, table):
+        row = db.fetch_one(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+        return row[0] + 1
+
+    def _insert(self, table, columns, count, make_row):
+        first_id = self._next_id(table)
+        query = f"INSERT INTO {table} (id, {', '.join(columns)}) VALUES ({', '.join(['%s'] * (len(columns) + 1))})"
+        batch = []
+        for n in range(count):
+            batch.append((first_id + n,) + make_row(n, first_id + n))
+            if len(batch) >= self.batch_size:
+                self._flush(query, batch)
+        self._flush(query, batch)
+        self.counts[table] = count
+        return list(range(first_id, first_id + count))
+
+    def _insert_enrollments(self, student_ids, subject_ids):
+        enrollment_query = "INSERT INTO enrollments (id, student_id, subject_id, status) VALUES (%s, %s, %s, %s)"
+        per_student = min(len(subject_ids), max(1, round(self.enrollments / max(len(student_ids), 1))))
+        enrollment_id = self._next_id("enrollments")
+        enrollments = []
+        grades = []
+        for student_id in student_ids:
+            for subject_id in self.random.sample(subject_ids, per_student):
+                status = self.random.choices(["approved", "pending", "denied"], [70, 20, 10])[0]
+                enrollments.append((enrollment_id, student_id, subject_id, status))
+                if status == "approved" and self.random.random() < self.graded_ratio:
+                    grades.append(self._grade(enrollment_id))
+                enrollment_id += 1
+            if len(enrollments) >= self.batch_size:
+                self._flush_enrollments(enrollment_query, enrollments, grades)
+        self._flush_enrollments(enrollment_query, enrollments, grades)
+
+    def _grade(self, enrollment_id):
+        score = lambda: min(100.0, max(0.0, round(self.random.gauss(80, 10), 2)))
+        if self.random.random() < 0.85:
+            return (enrollment_id, score(), score(), score())
+        return (enrollment_id, score())
+
+    def _flush_enrollments(self, enrollment_query, enrollments, grades):
+        # Count before flushing: _flush empties the batches it writes.
+        self.counts['enrollments'] = self.counts.get('enrollments', 0) + len(enrollments)
+        self.counts['grades'] = self.counts.get('grades', 0) + len(grades)
+        self._flush(enrollment_query, enrollments)
+        component = [g for g in grades if len(g) == 4]
+        legacy = [(g[0], g[1], "Passed" if g[1] >= 75 else "Failed") for g in grades if len(g) == 2]
+        if component:
+            rows = GradeEngine.upsert_rows(*zip(*component))
+            self._flush(Grade.COMPONENT_UPSERT, rows)
+        if legacy:
+            self._flush("INSERT INTO grades (enrollment_id, grade, remarks) VALUES (%s, %s, %s)", legacy)
+        grades.clear()
+
+    def _flush(self, query, batch):
+        if batch and db.execute_many(query, batch) is None:
+            raise RuntimeError(f"Seeding failed on: {query.split('(')[0].strip()}")
+        batch.clear()
\ No newline at end of file
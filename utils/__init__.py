@@ -1,2 +1,3 @@
 from .auth import Auth
-from .display import Display
\ No newline at end of file
+from .display import Display
+from .pager import Pager
\ No newline at end of file
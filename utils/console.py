@@ -0,0 +1,89 @@
+import io
+import sys
+import threading
+
+class ConsoleRouter:
+    """
+    Stand-in for sys.stdin/sys.stdout that forwards to the stream bound to the calling thread,
+    so print() and input() in the portals reach the right client when many sessions share one
+    process. Threads with no bound stream use the original console.
+    """
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    @property
+    def current(self):
+        return getattr(self._local, 'stream', None) or self.default
+
+    def bind(self, stream):
+        self._local.stream = stream
+
+    def unbind(self):
+        self._local.stream = None
+
+    def write(self, text):
+        return self.current.write(text)
+
+    def flush(self):
+        self.current.flush()
+
+    def readline(self, size=-1):
+        return self.current.readline(size)
+
+    def isatty(self):
+        return self.current.isatty()
+
+    def fileno(self):
+        # input() only reads through readline() when fileno() fails; the local console keeps
+        # its real descriptor so line editing still works there.
+        if getattr(self._local, 'stream', None) is not None:
+            raise io.UnsupportedOperation("session streams have no file descriptor")
+        return self.default.fileno()
+
+    def __getattr__(self, name):
+        return getattr(self.current, name)
+
+class SocketConsole:
+    """Line-oriented text stream over a connected socket, in the shape input() and print() expect"""
+    def __init__(self, sock):
+        self.sock = sock
+        # Reads accept \n or \r\n (netcat, telnet); writes send \r\n as telnet expects.
+        self._reader = sock.makefile('r', encoding='utf-8', errors='replace', newline=None)
+        self._writer = sock.makefile('w', encoding='utf-8', errors='replace', newline='\r\n')
+
+    def write(self, text):
+        return self._writer.write(text)
+
+    def flush(self):
+        self._writer.flush()
+
+    def readline(self, size=-1):
+        return self._reader.readline(size)
+
+    def isatty(self):
+        return False
+
+    def close(self):
+        for stream in (self._writer, self._reader):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+def install():
+    """Route sys.stdin and sys.stdout through ConsoleRouters; returns the (stdin, stdout) routers"""
+    if not isinstance(sys.stdin, ConsoleRouter):
+        sys.stdin = ConsoleRouter(sys.stdin)
+    if not isinstance(sys.stdout, ConsoleRouter):
+        sys.stdout = ConsoleRouter(sys.stdout)
+    return sys.stdin, sys.stdout
+
+def bind(stream):
+    """Send the calling thread's console I/O to stream (requires install())"""
+    sys.stdin.bind(stream)
+    sys.stdout.bind(stream)
+
+def unbind():
+    sys.stdin.unbind()
+    sys.stdout.unbind()
\ No newline at end of file
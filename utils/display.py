@@ -1,36 +1,65 @@
+import os
+import sys
 from colorama import Fore, Style
 
 class Display:
+    # Colors are dropped when output is piped or NO_COLOR is set.
+    use_color = sys.stdout.isatty() and 'NO_COLOR' not in os.environ
+
+    @staticmethod
+    def paint(color, text):
+        return f"{color}{text}{Style.RESET_ALL}" if Display.use_color else text
+
+    @staticmethod
+    def write(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    @staticmethod
+    def clear():
+        """Clear the terminal with ANSI sequences instead of spawning a shell"""
+        if Display.use_color:
+            Display.write("\033[2J\033[H")
+
     @staticmethod
     def header(title):
-        print(f"\n{Fore.CYAN}{'='*60}")
-        print(f"{Fore.YELLOW}{title.center(60)}")
-        print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        rule = Display.paint(Fore.CYAN, '='*60)
+        Display.write(f"\n{rule}\n{Display.paint(Fore.YELLOW, title.center(60))}\n{rule}\n")
 
     @staticmethod
     def menu(options):
-        print(f"\n{Fore.MAGENTA}Choose an option:{Style.RESET_ALL}")
-        for i, option in enumerate(options, 1):
-            print(f"{Fore.WHITE}{i}. {option}{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}0. Exit{Style.RESET_ALL}")
+        lines = [Display.paint(Fore.MAGENTA, "\nChoose an option:")]
+        lines += [Display.paint(Fore.WHITE, f"{i}. {option}") for i, option in enumerate(options, 1)]
+        lines.append(Display.paint(Fore.WHITE, "0. Exit"))
+        Display.write("\n".join(lines) + "\n")
 
     @staticmethod
     def success(message):
-        print(f"{Fore.GREEN}✓ {message}{Style.RESET_ALL}")
+        print(Display.paint(Fore.GREEN, f"✓ {message}"))
 
     @staticmethod
     def error(message):
-        print(f"{Fore.RED}✗ {message}{Style.RESET_ALL}")
+        print(Display.paint(Fore.RED, f"✗ {message}"))
 
     @staticmethod
     def info(message):
-        print(f"{Fore.BLUE}ℹ {message}{Style.RESET_ALL}")
+        print(Display.paint(Fore.BLUE, f"ℹ {message}"))
 
     @staticmethod
-    def table_header(headers):
-        print(f"\n{Fore.YELLOW}{' | '.join(f'{h:^15}' for h in headers)}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'-'*15*len(headers)}{Style.RESET_ALL}")
+    def table(headers, rows, max_width=40):
+        """Render a whole table with column widths fitted to the data, in a single write"""
+        cells = [[str(d) for d in row] for row in rows]
+        widths = [len(str(h)) for h in headers]
+        for row in cells:
+            for i, value in enumerate(row):
+                widths[i] = max(widths[i], len(value))
+        widths = [min(w, max_width) for w in widths]
 
-    @staticmethod
-    def table_row(data):
-        print(f"{Fore.WHITE}{' | '.join(f'{str(d):^15}' for d in data)}{Style.RESET_ALL}")
\ No newline at end of file
+        def line(values):
+            return ' | '.join(
+                (v if len(v) <= w else v[:w - 1] + '…').ljust(w) for v, w in zip(values, widths))
+
+        out = ["", Display.paint(Fore.YELLOW, line([str(h) for h in headers])),
+               Display.paint(Fore.CYAN, '-+-'.join('-'*w for w in widths))]
+        out += [Display.paint(Fore.WHITE, line(row)) for row in cells]
+        Display.write("\n".join(out) + "\n")
\ No newline at end of file
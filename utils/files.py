@@ -0,0 +1,23 @@
+import os
+
+# Set by 'main.py --serve': remote clients may only name files inside this directory.
+# None (a local session) leaves paths as typed.
+sandbox = None
+
+REFUSED = "Enter a plain file name; remote sessions can only use the server's file directory"
+
+def resolve(name):
+    """The file a name typed at a prompt refers to, or None if it is not allowed in server mode"""
+    if sandbox is None:
+        return name
+    name = name.strip()
+    if not name or '/' in name or '\\' in name or '..' in name or os.path.isabs(name):
+        return None
+    return os.path.join(sandbox, name)
+
+def resolve_or_report(display, name):
+    """resolve(name), showing REFUSED on display when the name is not allowed"""
+    path = resolve(name)
+    if path is None:
+        display.error(REFUSED)
+    return path
\ No newline at end of file
@@ -0,0 +1,33 @@
+class Pager:
+    """Keyset pagination over a model *_page method; rows must carry their key in column 0"""
+    def __init__(self, fetch_page, render, page_size=20):
+        self.fetch_page = fetch_page
+        self.render = render
+        self.page_size = page_size
+
+    def run(self, prompt="\nPress Enter to continue (n = next page, p = previous page): "):
+        """Show pages until the user enters something other than n/p, and return that input"""
+        rows = self.fetch_page(limit=self.page_size)
+        if not rows:
+            return None
+        page = 1
+        while True:
+            self.render(rows)
+            print(f"Page {page}")
+            choice = input(prompt).strip()
+            if choice.lower() == 'n':
+                next_rows = self.fetch_page(after=rows[-1][0], limit=self.page_size) if len(rows) == self.page_size else []
+                if next_rows:
+                    rows = next_rows
+                    page += 1
+                else:
+                    print("Already on the last page")
+            elif choice.lower() == 'p':
+                previous_rows = self.fetch_page(before=rows[0][0], limit=self.page_size) if page > 1 else []
+                if previous_rows:
+                    rows = previous_rows
+                    page -= 1
+                else:
+                    print("Already on the first page")
+            else:
+                return choice